@@ -1,11 +1,11 @@
-import dataclasses
 import os
 
-import numpy as np
 import wx
 
 from wx.lib.newevent import NewEvent
 
+from cartograpy.rects import Rect, Rects
+
 
 IMAGE_WILDCARD = "All files (*)|*|BMP files (*.bmp)|*.bmp|JPG files (*.jpg)|*.jpg|PNG files (*.png)|*.png"
 
@@ -17,108 +17,17 @@ ASSET_DIR = os.path.join(ROOT_DIR, "assets")
 ALL_EXPAND = wx.ALL | wx.EXPAND
 
 
-LayerAddEvent, EVT_LAYER_ADD = NewEvent()
-LayerBackwardEvent, EVT_LAYER_BACKWARD = NewEvent()
-LayerDuplicateEvent, EVT_LAYER_DUPLICATE = NewEvent()
-LayerForwardEvent, EVT_LAYER_FORWARD = NewEvent()
-LayerRemoveEvent, EVT_LAYER_REMOVE = NewEvent()
+# The layer menu and layer properties post a single event type, and the
+# `action` property of the event decides how it is handled
+LayerEvent, EVT_LAYER = NewEvent()
+
+LAYER_ADD = 0
+LAYER_BACKWARD = 1
+LAYER_DUPLICATE = 2
+LAYER_FORWARD = 3
+LAYER_REMOVE = 4
+LAYER_UPDATE_FILENAME = 5
+
 LayerSelectedEvent, EVT_LAYER_SELECTED = NewEvent()
 SwapLayerEvent, EVT_SWAP_LAYER = NewEvent()
-UpdateFilenameEvent, EVT_UPDATE_FILENAME = NewEvent()
 UpdateVisibilityEvent, EVT_UPDATE_VISIBILITY = NewEvent()
-
-
-@dataclasses.dataclass
-class Rect:
-    """Represents a rectangle."""
-
-    x: int = 0
-    y: int = 0
-    w: int = 0
-    h: int = 0
-
-    def to_dict(self):
-        return {
-            "x": self.x,
-            "y": self.y,
-            "w": self.w,
-            "h": self.h,
-        }
-
-    def scale(self, scale):
-        return Rect(self.x * scale, self.y * scale, self.w * scale, self.h * scale)
-
-
-class Rects:
-    """Represents a group of rectangles.
-
-    This class uses numpy arrays for faster calculations.
-    """
-
-    def __init__(self, rects: list = None):
-        if rects is None:
-            rects = list()
-
-        x = list()
-        y = list()
-        w = list()
-        h = list()
-
-        for rect in rects:
-            x.append(rect.x)
-            y.append(rect.y)
-            w.append(rect.w)
-            h.append(rect.h)
-
-        self.rects = np.array([x, y, w, h])
-
-    def append(self, rect: Rect):
-        self.rects = np.append(
-            self.rects, [[rect.x], [rect.y], [rect.w], [rect.h]], axis=1
-        )
-
-    def delete(self, index: int):
-        self.rects = np.delete(self.rects, index, axis=1)
-
-    def get(self, index: int):
-        return self[index]
-
-    def insert(self, index: int, rect: Rect):
-        self.rects = np.insert(
-            self.rects, index, [rect.x, rect.y, rect.w, rect.h], axis=1
-        )
-
-    def move(self, index: int, dx: int = 0, dy: int = 0):
-        self.rects[0][index] += dx
-        self.rects[1][index] += dy
-
-    def set(self, index: int, rect: Rect):
-        self[index] = rect
-
-    def size(self):
-        return len(self)
-
-    @property
-    def x(self):
-        return self.rects[0]
-
-    @property
-    def y(self):
-        return self.rects[1]
-
-    @property
-    def w(self):
-        return self.rects[2]
-
-    @property
-    def h(self):
-        return self.rects[3]
-
-    def __len__(self):
-        return self.rects.shape[1]
-
-    def __getitem__(self, key: int):
-        return Rect(*self.rects[:, key])
-
-    def __setitem__(self, key: int, value: Rect):
-        self.rects[:, key] = [value.x, value.y, value.w, value.h]
@@ -1,9 +1,89 @@
 """The canvas is where the layers are rendered and moved around."""
 
 
+import math
+
 import wx
 
 from cartograpy import Rects
+from cartograpy.layer_table import LayerTable
+
+
+def scale_factor(zoom_level: int):
+    """Computes the scale factor for a zoom level.
+
+    The equation for calculating the scale factor is::
+
+        (|x| + 1)^{\\frac{x}{|x|}}
+
+    Parameters
+    ------------
+    zoom_level: int
+        the zoom level of the canvas.
+
+    Returns
+    ---------
+    float:
+        the scale factor of the canvas.
+    """
+    if zoom_level == 0:
+        return 1
+
+    return (abs(zoom_level) + 1) ** (zoom_level / abs(zoom_level))
+
+
+def draw_bitmaps(dc: wx.DC, render_order: list, destinations: list):
+    """Draws the bitmaps of a render order scaled to their destinations with a
+    graphics context.
+
+    Each bitmap is converted to a graphics bitmap once, so that layers that
+    share a bitmap, such as duplicated layers, do not convert it again.
+
+    Parameters
+    ------------
+    dc: wx.DC
+        the device context to draw the bitmaps on.
+    render_order: list
+        the index and bitmap of the layers, in the order they are drawn.
+    destinations: list
+        the `(x, y, w, h)` destination of each layer by index.
+    """
+    gc = wx.GraphicsContext.Create(dc)
+    graphics_bitmaps = dict()
+
+    for n, bitmap in render_order:
+        key = id(bitmap)
+
+        if key not in graphics_bitmaps:
+            graphics_bitmaps[key] = gc.CreateBitmap(bitmap)
+
+        gc.DrawBitmap(graphics_bitmaps[key], *destinations[n])
+
+
+def same_render_order(a: list, b: list):
+    """Checks if two render orders draw the same bitmaps in the same order.
+
+    The bitmaps are compared by identity, since the scaled bitmaps are cached
+    and reused.
+
+    Parameters
+    ------------
+    a: list
+        the first render order.
+    b: list
+        the second render order.
+
+    Returns
+    ---------
+    bool:
+        if the render orders are the same.
+    """
+    return len(a) == len(b) and all(
+        n == m and bitmap_a is bitmap_b for (n, bitmap_a), (m, bitmap_b) in zip(a, b)
+    )
+
+
+SCALE_FACTORS = {z: scale_factor(z) for z in range(-64, 65)}
 
 
 class Canvas(wx.Panel):
@@ -16,22 +96,35 @@ class Canvas(wx.Panel):
 
     The internal parameters are:
 
-    - `render_order` is a list of layer data indicating the order to render the
-      layers.
-    - `paths` maps layer data to the path of the image.
+    - `layer_table` is the `LayerTable` of the order, visibility, and image
+      paths of the layers, which is shared with the minimap.
+    - `render_order` is a list of the index and bitmap of the visible layers,
+      in the order they are rendered.
     - `bitmaps` maps the path of the image to a `wx.Bitmap` object.
     - `destinations` maps layer data to a `Rect` defining where on the canvas
       the corresponding bitmap will be rendered.
+    - `scene` is a `wx.Bitmap` of the rendered layers, which is only
+      allocated again when the canvas is resized.
+    - `dirty` is `True` if the layers have changed since the scene was last
+      rendered.
+    - `size` is the `(w, h)` size of the canvas, which is updated when the
+      canvas is resized.
 
     Parameters
     ------------
     parent: wx.Frame
         The parent window of the application.
+    layer_table: LayerTable
+        The order, visibility, and image paths of the layers.
     """
 
-    def __init__(self, parent: wx.Frame):
+    def __init__(self, parent: wx.Frame, layer_table: LayerTable):
         super().__init__(parent=parent)
 
+        self.layer_table = layer_table
+        self.size = self.GetSize().Get()
+        self.scene = None
+
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
 
         # Mouse events
@@ -44,6 +137,7 @@ class Canvas(wx.Panel):
 
         # Render events
         self.Bind(wx.EVT_PAINT, self.__on_paint)
+        self.Bind(wx.EVT_SIZE, self.__on_size)
 
         self.reset()
 
@@ -56,9 +150,7 @@ class Canvas(wx.Panel):
             the JSON compatible state of the canvas.
         """
         data = {
-            "order": self.order,
-            "visibility": self.visibility,
-            "paths": self.paths,
+            **self.layer_table.to_dict(),
             "destinations": self.destinations.tolist(),
             "zoom_level": self.zoom_level,
             "scale_factor": self.scale_factor,
@@ -66,23 +158,32 @@ class Canvas(wx.Panel):
 
         return data
 
+    def invalidate(self):
+        """Marks the rendered scene as dirty so that the layers are rendered
+        again on the next repaint.
+
+        This should be called whenever the destinations, bitmaps, or render
+        order of the layers change.
+        """
+        self.dirty = True
+
     def reset(self):
         """Clears the current canvas and resets all values."""
-        self.order = list()
-        self.visibility = list()
-        self.paths = dict()
+        self.dirty = True
+        self.render_order = list()
         self.bitmaps = dict()
         self.destinations = Rects()
 
         self.zoom_level = 0
         self.scale_factor = 1
+        self.scale_step = 1
 
     def zoom(self, dz: int = 0):
         """Increases or decreases the zoom level and computes the scale factor.
 
-        The equation for calculating the scale factor is::
-
-            (|x| + 1)^{\\frac{x}{|x|}}
+        The scale factors of common zoom levels are precomputed in
+        `SCALE_FACTORS`. The smallest whole number of pixels that moves a layer
+        by at least one pixel of its image is stored in `scale_step`.
 
         Parameters
         ------------
@@ -91,35 +192,119 @@ class Canvas(wx.Panel):
         """
         self.zoom_level += dz
 
-        if self.zoom_level == 0:
-            self.scale_factor = 1
+        if self.zoom_level in SCALE_FACTORS:
+            self.scale_factor = SCALE_FACTORS[self.zoom_level]
 
         else:
-            self.scale_factor = (abs(self.zoom_level) + 1) ** (
-                self.zoom_level / abs(self.zoom_level)
-            )
+            self.scale_factor = scale_factor(self.zoom_level)
+
+        self.scale_step = math.ceil(self.scale_factor)
 
     def __to_parent(self, event: wx.Event):
         """Passes the event to the parent object."""
         wx.PostEvent(self.Parent, event)
 
+    def update_render_order(self):
+        """Rebuilds the list of visible layers from the order and visibility.
+
+        This should be called whenever the order, visibility, or bitmaps of the
+        layers change, so that the visibility and bitmaps do not need to be
+        looked up on every repaint. The scene is only invalidated if the render
+        order changed.
+
+        Returns
+        ---------
+        bool:
+            if the render order changed.
+        """
+        render_order = [
+            (n, self.bitmaps[self.layer_table.paths[key]])
+            for n, key in enumerate(self.layer_table.order)
+            if self.layer_table.visibility[n]
+        ]
+
+        if same_render_order(render_order, self.render_order):
+            return False
+
+        self.dirty = True
+        self.render_order = render_order
+
+        return True
+
     def __on_paint(self, event: wx.PaintEvent):
         """Repaints the canvas.
 
+        The layers are only rendered into the scene when it is dirty, otherwise
+        the previously rendered scene is drawn.
+
         Parameters
         ------------
         event: wx.PaintEvent
             a paint event is sent when a window's contents needs to be
             repainted.
         """
-        dc = wx.AutoBufferedPaintDC(self)
-        gc = wx.GraphicsContext.Create(dc)
+        dc = wx.PaintDC(self)
+        w, h = self.GetClientSize().Get()
+
+        if w <= 0 or h <= 0:
+            return
+
+        if self.scene is None or self.scene.GetSize().Get() != (w, h):
+            self.scene = wx.Bitmap(w, h)
+            self.dirty = True
+
+        if self.dirty:
+            memory_dc = wx.MemoryDC(self.scene)
+            self.__render(memory_dc, w, h)
+            memory_dc.SelectObject(wx.NullBitmap)
+            self.dirty = False
+
+        dc.DrawBitmap(self.scene, 0, 0)
+
+    def __on_size(self, event: wx.SizeEvent):
+        """Allocates the scene again when the canvas is resized.
+
+        Parameters
+        ------------
+        event: wx.SizeEvent
+            a size event is sent when the size of the canvas changes.
+        """
+        self.size = event.GetSize().Get()
+        w, h = self.size
+
+        self.scene = wx.Bitmap(w, h) if w > 0 and h > 0 else None
+        self.invalidate()
+        self.Refresh()
+        event.Skip()
+
+    def __render(self, dc: wx.DC, w: int, h: int):
+        """Renders the visible layers that are on screen.
+
+        Parameters
+        ------------
+        dc: wx.DC
+            the device context to render the layers on.
+        w: int
+            the width of the canvas.
+        h: int
+            the height of the canvas.
+        """
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
 
-        for n, key in enumerate(self.order):
-            if not self.visibility[n]:
-                continue
+        on_screen = self.destinations.cull(0, 0, w, h).tolist()
+        render_order = [(n, bitmap) for n, bitmap in self.render_order if on_screen[n]]
 
-            gc.DrawBitmap(
-                bmp=self.bitmaps[self.paths[key]],
-                **self.destinations[n].to_dict(),
-            )
+        # Read the destinations once instead of once per layer
+        destinations = self.destinations.rects.T.tolist()
+
+        # Unscaled layers can be blitted directly without a graphics context
+        if self.scale_factor == 1:
+            draw = dc.DrawBitmap
+
+            for n, bitmap in render_order:
+                x, y, _, _ = destinations[n]
+                draw(bitmap, x, y, useMask=True)
+
+        else:
+            draw_bitmaps(dc, render_order, destinations)
@@ -5,25 +5,21 @@ import wx
 
 from cartograpy import (
     ALL_EXPAND,
-    EVT_LAYER_ADD,
-    EVT_LAYER_BACKWARD,
-    EVT_LAYER_DUPLICATE,
-    EVT_LAYER_FORWARD,
-    EVT_LAYER_REMOVE,
-    EVT_SWAP_LAYER,
-    EVT_UPDATE_FILENAME,
-    EVT_UPDATE_VISIBILITY,
-    LayerAddEvent,
-    LayerBackwardEvent,
-    LayerDuplicateEvent,
-    LayerForwardEvent,
-    LayerRemoveEvent,
+    EVT_LAYER,
+    LAYER_ADD,
+    LAYER_BACKWARD,
+    LAYER_DUPLICATE,
+    LAYER_FORWARD,
+    LAYER_REMOVE,
+    LAYER_UPDATE_FILENAME,
+    LayerEvent,
     LayerSelectedEvent,
     SwapLayerEvent,
-    UpdateFilenameEvent,
     UpdateVisibilityEvent,
 )
+from cartograpy.layer_list import LayerList
 from cartograpy.layer_menu import LayerMenu
+from cartograpy.layer_table import LayerTable
 from cartograpy.layer_properties import LayerProperties
 from cartograpy.minimap import Minimap
 
@@ -53,14 +49,17 @@ class Inspector(wx.Panel):
     ------------
     parent: wx.Frame
         the parent window of the application.
+    layer_table: LayerTable
+        the order, visibility, and image paths of the layers, which is passed
+        to the minimap.
     """
 
-    def __init__(self, parent: wx.Frame):
+    def __init__(self, parent: wx.Frame, layer_table: LayerTable):
         super().__init__(parent=parent)
 
         self.SetMaxSize(wx.Size(400, -1))
 
-        self.minimap = Minimap(parent=self)
+        self.minimap = Minimap(parent=self, layer_table=layer_table)
         self.layer_properties = LayerProperties(parent=self)
         self.layer_menu = LayerMenu(parent=self)
         self.__init_layers()
@@ -71,12 +70,17 @@ class Inspector(wx.Panel):
         self.Bind(wx.EVT_LIST_ITEM_CHECKED, self.__on_list_item_checked)
         self.Bind(wx.EVT_LIST_ITEM_UNCHECKED, self.__on_list_item_checked)
 
-        self.Bind(EVT_LAYER_ADD, self.__on_layer_add)
-        self.Bind(EVT_LAYER_BACKWARD, self.__on_layer_backward)
-        self.Bind(EVT_LAYER_DUPLICATE, self.__on_layer_duplicate)
-        self.Bind(EVT_LAYER_FORWARD, self.__on_layer_forward)
-        self.Bind(EVT_LAYER_REMOVE, self.__on_layer_remove)
-        self.Bind(EVT_UPDATE_FILENAME, self.__on_update_filename)
+        # Handlers for each action of the layer events
+        self.layer_handlers = {
+            LAYER_ADD: self.__on_layer_add,
+            LAYER_BACKWARD: self.__on_layer_backward,
+            LAYER_DUPLICATE: self.__on_layer_duplicate,
+            LAYER_FORWARD: self.__on_layer_forward,
+            LAYER_REMOVE: self.__on_layer_remove,
+            LAYER_UPDATE_FILENAME: self.__on_update_filename,
+        }
+
+        self.Bind(EVT_LAYER, self.__on_layer)
 
         self.reset()
 
@@ -89,14 +93,7 @@ class Inspector(wx.Panel):
             the JSON compatible state of the inspector.
         """
         data = {
-            "layers": [
-                {
-                    "text": self.layers.GetItemText(i),
-                    "data": self.layers.GetItemData(i),
-                    "checked": self.layers.IsItemChecked(i),
-                }
-                for i in range(self.layers.GetItemCount())
-            ],
+            "layers": self.layers.to_list(),
             "minimap": self.minimap.to_dict(),
         }
 
@@ -105,98 +102,93 @@ class Inspector(wx.Panel):
     def reset(self):
         """Clears the current inspector and resets all values."""
         self.minimap.reset()
+        self.layer_properties.reset()
         self.layer_menu.reset()
         self.layers.DeleteAllItems()
 
+        self.last_filename = None
+
     def __init_layers(self):
         """Initializes the layer controller."""
-        self.layers = wx.ListCtrl(
-            parent=self,
-            id=wx.ID_ANY,
-            pos=wx.DefaultPosition,
-            size=wx.DefaultSize,
-            style=wx.LC_REPORT
-            | wx.LC_ALIGN_LEFT
-            | wx.LC_NO_HEADER
-            | wx.LC_SINGLE_SEL
-            | wx.LC_HRULES,
-            validator=wx.DefaultValidator,
-            name="Layers",
-        )
+        self.layers = LayerList(parent=self)
+
+    def __on_layer(self, event: LayerEvent):
+        """Passes the layer event to the handler of its action.
+
+        Parameters
+        ------------
+        event: LayerEvent
+            the event is expected to have an `action` property.
+        """
+        # Adding, removing, and moving layers changes the layers in the rows,
+        # so the same filename must be passed on again
+        if event.action != LAYER_UPDATE_FILENAME:
+            self.last_filename = None
 
-        self.layers.EnableCheckBoxes()
-        self.layers.InsertColumn(col=0, heading="Name", width=400)
+        self.layer_handlers[event.action](event)
 
-    def __on_layer_add(self, event: LayerAddEvent):
+    def __on_layer_add(self, event: LayerEvent):
         """Adds a layer from an image file.
 
         Parameters
         ------------
-        event: LayerAddEvent
+        event: LayerEvent
             the event is expected to have a `path` property.
         """
         wx.PostEvent(self.Parent, event)
 
-    def __on_layer_backward(self, event: LayerBackwardEvent):
+    def __on_layer_backward(self, event: LayerEvent):
         """Moves a layer backward.
 
         Parameters
         ------------
-        event: LayerBackwardEvent
+        event: LayerEvent
         """
-        selected = self.layers.GetFirstSelected()
+        selected = self.layers.selected
         n_layers = self.layers.GetItemCount()
 
-        if selected < n_layers:
+        if 0 <= selected < n_layers - 1:
             new_index = selected + 1
 
-            item = self.layers.GetItem(selected)
-            item.SetId(new_index)
-
-            self.layers.DeleteItem(selected)
-            self.layers.InsertItem(item)
-            self.layers.CheckItem(new_index)
-            self.layers.Select(new_index)
+            with wx.WindowUpdateLocker(self.layers):
+                self.layers.swap(selected, new_index)
+                self.layers.Select(new_index)
 
             wx.PostEvent(self.Parent, SwapLayerEvent(layers=(selected, new_index)))
 
-    def __on_layer_duplicate(self, event: LayerDuplicateEvent):
+    def __on_layer_duplicate(self, event: LayerEvent):
         """Duplicates the currently selected layer.
 
         Parameters
         ------------
-        event: LayerDuplicateEvent
+        event: LayerEvent
         """
         wx.PostEvent(self.Parent, event)
 
-    def __on_layer_forward(self, event: LayerForwardEvent):
+    def __on_layer_forward(self, event: LayerEvent):
         """Moves a layer forward.
 
         Parameters
         ------------
-        event: LayerForwardEvent
+        event: LayerEvent
         """
-        selected = self.layers.GetFirstSelected()
+        selected = self.layers.selected
 
         if selected > 0:
             new_index = selected - 1
 
-            item = self.layers.GetItem(selected)
-            item.SetId(new_index)
-
-            self.layers.DeleteItem(selected)
-            self.layers.InsertItem(item)
-            self.layers.CheckItem(new_index)
-            self.layers.Select(new_index)
+            with wx.WindowUpdateLocker(self.layers):
+                self.layers.swap(selected, new_index)
+                self.layers.Select(new_index)
 
             wx.PostEvent(self.Parent, SwapLayerEvent(layers=(selected, new_index)))
 
-    def __on_layer_remove(self, event: LayerRemoveEvent):
+    def __on_layer_remove(self, event: LayerEvent):
         """Removes the currently selected layer.
 
         Parameters
         ------------
-        event: LayerRemoveEvent
+        event: LayerEvent
         """
         wx.PostEvent(self.Parent, event)
 
@@ -217,6 +209,7 @@ class Inspector(wx.Panel):
         ------------
         event: LayerSelectEvent
         """
+        self.last_filename = None
         wx.PostEvent(self.Parent, LayerSelectedEvent())
 
     def __on_list_item_checked(self, event: wx.ListEvent):
@@ -226,20 +219,37 @@ class Inspector(wx.Panel):
         ------------
         event: wx.ListEvent
         """
-        wx.PostEvent(self.Parent, UpdateVisibilityEvent())
+        index = event.GetIndex()
+        show = event.GetEventType() == wx.wxEVT_LIST_ITEM_CHECKED
+
+        self.layers.CheckItem(index, show)
+
+        wx.PostEvent(self.Parent, UpdateVisibilityEvent(index=index, show=show))
 
-    def __on_update_filename(self, event: UpdateFilenameEvent):
+    def __on_update_filename(self, event: LayerEvent):
         """When the filename property has been changed.
 
+        The event is only passed on if the filename of the layer is different
+        from the last one that was passed on. The layers are told apart by their
+        item data, since the row of a layer can change.
+
         Parameters
         ------------
-        event: UpdateFilenameEvent
+        event: LayerEvent
+            the event is expected to have a `filename` property and an integer
+            `data` property of the item data of the layer.
         """
+        last_filename = (event.filename, event.data)
+
+        if last_filename == self.last_filename:
+            return
+
+        self.last_filename = last_filename
+
         wx.PostEvent(
             self.Parent,
-            UpdateFilenameEvent(
-                filename=event.filename,
-                index=self.layers.GetFirstSelected(),
+            LayerEvent(
+                action=LAYER_UPDATE_FILENAME, filename=event.filename, data=event.data
             ),
         )
 
@@ -0,0 +1,191 @@
+"""Kernels for operations on the rectangle arrays of `Rects`.
+
+The kernels are compiled with Numba when it is installed, which fuses each
+operation into a single loop over the rectangles and avoids the overhead of
+indexing numpy arrays from Python for single rectangles. Otherwise, the
+equivalent numpy operations are used.
+
+Numba is only imported when a kernel is first used, so that importing it does
+not slow down starting the application. The kernels do not check their
+indices, so the callers must validate them first.
+"""
+
+import numpy as np
+
+KERNELS = ("move", "pan", "bounds", "fit", "shift_left", "shift_right", "swap")
+
+
+def _move_numpy(rects: np.ndarray, index: int, dx: int, dy: int):
+    """Moves a single rectangle."""
+    rects[0, index] += dx
+    rects[1, index] += dy
+
+
+def _pan_numpy(rects: np.ndarray, dx: int, dy: int):
+    """Moves all of the rectangles by the same amount."""
+    rects[0] += dx
+    rects[1] += dy
+
+
+def _bounds_numpy(rects: np.ndarray):
+    """Returns the smallest rectangle that contains all of the rectangles as
+    an `(x_min, y_min, x_max, y_max)` tuple.
+    """
+    # Reduce both axes at once, and add the sizes with a single temporary
+    x_min, y_min = rects[:2].min(axis=1).tolist()
+    x_max, y_max = (rects[:2] + rects[2:]).max(axis=1).tolist()
+
+    return x_min, y_min, x_max, y_max
+
+
+def _fit_numpy(source: np.ndarray, target: np.ndarray, x: int, y: int, factor: float):
+    """Moves the rectangles so that `(x, y)` is the origin and scales them into
+    the target rectangles.
+
+    Returns `True` if any of the target rectangles changed.
+    """
+    previous = target.copy()
+
+    np.subtract(source[0], x, out=target[0])
+    np.subtract(source[1], y, out=target[1])
+    np.multiply(target[:2], factor, out=target[:2], casting="unsafe")
+    np.multiply(source[2:], factor, out=target[2:], casting="unsafe")
+
+    return not np.array_equal(target, previous)
+
+
+def _shift_left_numpy(buf: np.ndarray, index: int, size: int):
+    """Shifts the rectangles after `index` one column to the left, overwriting
+    the rectangle at `index`.
+    """
+    buf[:, index : size - 1] = buf[:, index + 1 : size]
+
+
+def _shift_right_numpy(buf: np.ndarray, index: int, size: int):
+    """Shifts the rectangles from `index` one column to the right, leaving a
+    gap at `index`. The buffer must have room for `size + 1` rectangles.
+    """
+    buf[:, index + 1 : size + 1] = buf[:, index:size]
+
+
+def _swap_numpy(buf: np.ndarray, i: int, j: int):
+    """Swaps two rectangles."""
+    column = buf[:, i].copy()
+    buf[:, i] = buf[:, j]
+    buf[:, j] = column
+
+
+def _move_loop(rects: np.ndarray, index: int, dx: int, dy: int):
+    """Moves a single rectangle."""
+    rects[0, index] += dx
+    rects[1, index] += dy
+
+
+def _pan_loop(rects: np.ndarray, dx: int, dy: int):
+    """Moves all of the rectangles by the same amount."""
+    for i in range(rects.shape[1]):
+        rects[0, i] += dx
+        rects[1, i] += dy
+
+
+def _bounds_loop(rects: np.ndarray):
+    """Returns the smallest rectangle that contains all of the rectangles
+    as an `(x_min, y_min, x_max, y_max)` tuple.
+    """
+    if rects.shape[1] == 0:
+        raise ValueError("cannot compute the bounds of zero rectangles")
+
+    x_min = rects[0, 0]
+    y_min = rects[1, 0]
+    x_max = rects[0, 0] + rects[2, 0]
+    y_max = rects[1, 0] + rects[3, 0]
+
+    for i in range(1, rects.shape[1]):
+        x_min = min(x_min, rects[0, i])
+        y_min = min(y_min, rects[1, i])
+        x_max = max(x_max, rects[0, i] + rects[2, i])
+        y_max = max(y_max, rects[1, i] + rects[3, i])
+
+    return x_min, y_min, x_max, y_max
+
+
+def _fit_loop(source: np.ndarray, target: np.ndarray, x: int, y: int, factor: float):
+    """Moves the rectangles so that `(x, y)` is the origin and scales them
+    into the target rectangles.
+
+    Returns `True` if any of the target rectangles changed.
+    """
+    changed = False
+
+    # The rows are updated one by one, since Numba cannot iterate over a tuple
+    # mixing the integer type of the origin with literal zeros
+    for i in range(source.shape[1]):
+        x_new = int((source[0, i] - x) * factor)
+        y_new = int((source[1, i] - y) * factor)
+        w_new = int(source[2, i] * factor)
+        h_new = int(source[3, i] * factor)
+
+        if (
+            target[0, i] != x_new
+            or target[1, i] != y_new
+            or target[2, i] != w_new
+            or target[3, i] != h_new
+        ):
+            target[0, i] = x_new
+            target[1, i] = y_new
+            target[2, i] = w_new
+            target[3, i] = h_new
+            changed = True
+
+    return changed
+
+
+def _shift_left_loop(buf: np.ndarray, index: int, size: int):
+    """Shifts the rectangles after `index` one column to the left,
+    overwriting the rectangle at `index`.
+    """
+    for i in range(index, size - 1):
+        for row in range(4):
+            buf[row, i] = buf[row, i + 1]
+
+
+def _shift_right_loop(buf: np.ndarray, index: int, size: int):
+    """Shifts the rectangles from `index` one column to the right, leaving
+    a gap at `index`. The buffer must have room for `size + 1` rectangles.
+    """
+    for i in range(size, index, -1):
+        for row in range(4):
+            buf[row, i] = buf[row, i - 1]
+
+
+def _swap_loop(buf: np.ndarray, i: int, j: int):
+    """Swaps two rectangles."""
+    for row in range(4):
+        buf[row, i], buf[row, j] = buf[row, j], buf[row, i]
+
+
+def _load():
+    """Sets the kernels to the compiled loops when Numba is installed, or to
+    the numpy operations otherwise.
+    """
+    try:
+        import numba
+
+    except ImportError:
+        kernels = {name: globals()[f"_{name}_numpy"] for name in KERNELS}
+
+    else:
+        kernels = {
+            name: numba.njit(cache=True)(globals()[f"_{name}_loop"]) for name in KERNELS
+        }
+
+    globals().update(kernels)
+
+
+def __getattr__(name: str):
+    """Loads the kernels the first time one of them is used."""
+    if name in KERNELS:
+        _load()
+        return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
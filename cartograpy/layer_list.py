@@ -0,0 +1,221 @@
+"""The layer list displays the imported images as layers in the inspector."""
+
+
+import wx
+
+
+LAYER_LIST_STYLE = (
+    wx.LC_REPORT
+    | wx.LC_ALIGN_LEFT
+    | wx.LC_NO_HEADER
+    | wx.LC_SINGLE_SEL
+    | wx.LC_HRULES
+    | wx.LC_VIRTUAL
+)
+
+
+class LayerList(wx.ListCtrl):
+    """The layer list displays the imported images as layers in the inspector.
+
+    The list control is virtual, so the rows are stored in the parallel lists
+    `texts`, `data`, and `checked`, and the list control only asks for the rows
+    that are currently shown. The item methods of `wx.ListCtrl` that are used
+    by the application are overridden to operate on these lists, so inserting,
+    removing, and reordering layers does not go through the native list
+    control for every row.
+
+    The JSON compatible state of the items is cached by `to_list` until the
+    items are changed, and the selected item is tracked in `selected` so that
+    it does not need to be queried from the list control.
+
+    Unlike the native list control, checking an item with `CheckItem` does not
+    send an `EVT_LIST_ITEM_CHECKED` event. The events are still sent when the
+    user clicks on the checkbox of an item.
+
+    Parameters
+    ------------
+    parent: wx.Window
+        the parent window of this component.
+    """
+
+    def __init__(self, parent: wx.Window):
+        super().__init__(
+            parent=parent,
+            id=wx.ID_ANY,
+            pos=wx.DefaultPosition,
+            size=wx.DefaultSize,
+            style=LAYER_LIST_STYLE,
+            validator=wx.DefaultValidator,
+            name="Layers",
+        )
+
+        self.EnableCheckBoxes()
+        self.InsertColumn(col=0, heading="Name", width=400)
+
+        self.Bind(wx.EVT_LIST_END_LABEL_EDIT, self.__on_end_label_edit)
+        self.Bind(wx.EVT_LIST_ITEM_DESELECTED, self.__on_item_deselected)
+        self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.__on_item_selected)
+
+        self.texts = list()
+        self.data = list()
+        self.checked = list()
+        self.selected = -1
+        self.__cache = None
+
+    def swap(self, i: int, j: int):
+        """Swaps two items in the list.
+
+        Parameters
+        ------------
+        i: int
+            the index of the first item.
+        j: int
+            the index of the second item.
+        """
+        self.texts[i], self.texts[j] = self.texts[j], self.texts[i]
+        self.data[i], self.data[j] = self.data[j], self.data[i]
+        self.checked[i], self.checked[j] = self.checked[j], self.checked[i]
+        self.__cache = None
+        self.RefreshItem(i)
+        self.RefreshItem(j)
+
+    def to_list(self):
+        """Returns the state of the items as a JSON compatible list.
+
+        Returns
+        ---------
+        list:
+            the JSON compatible state of the items.
+        """
+        if self.__cache is None:
+            self.__cache = [
+                {
+                    "text": text,
+                    "data": data,
+                    "checked": checked,
+                }
+                for text, data, checked in zip(self.texts, self.data, self.checked)
+            ]
+
+        return self.__cache
+
+    def CheckItem(self, item: int, check: bool = True):
+        self.checked[item] = check
+        self.__cache = None
+        self.RefreshItem(item)
+
+    def DeleteAllItems(self):
+        self.texts.clear()
+        self.data.clear()
+        self.checked.clear()
+        self.selected = -1
+        self.__cache = None
+        self.SetItemCount(0)
+        self.Refresh()
+
+        return True
+
+    def DeleteItem(self, item: int):
+        del self.texts[item]
+        del self.data[item]
+        del self.checked[item]
+        self.__cache = None
+
+        if self.selected >= len(self.texts):
+            self.selected = -1
+        self.SetItemCount(len(self.texts))
+        self.Refresh()
+
+        return True
+
+    def GetFirstSelected(self, *args):
+        return self.selected
+
+    def GetItemCount(self):
+        return len(self.texts)
+
+    def GetItemData(self, item: int):
+        # Negative indices would silently read from the end of the list
+        if not 0 <= item < len(self.data):
+            raise IndexError(f"invalid item index {item}")
+
+        return self.data[item]
+
+    def GetItemText(self, item: int, col: int = 0):
+        return self.texts[item]
+
+    def InsertItem(self, index: int, label: str):
+        self.texts.insert(index, label)
+        self.data.insert(index, 0)
+        self.checked.insert(index, False)
+        self.__cache = None
+        self.SetItemCount(len(self.texts))
+        self.Refresh()
+
+        return index
+
+    def IsItemChecked(self, item: int):
+        return self.checked[item]
+
+    def OnGetItemIsChecked(self, item: int):
+        return self.checked[item]
+
+    def OnGetItemText(self, item: int, col: int):
+        return self.texts[item]
+
+    def Select(self, idx: int, on: bool = True):
+        # The index is out of range after the bottom item has been removed
+        if not 0 <= idx < len(self.texts):
+            return
+
+        if on:
+            self.selected = idx
+
+        elif self.selected == idx:
+            self.selected = -1
+
+        super().Select(idx, on)
+
+    def SetItemData(self, item: int, data: int):
+        self.data[item] = data
+        self.__cache = None
+
+        return True
+
+    def SetItemText(self, item: int, text: str):
+        self.texts[item] = text
+        self.__cache = None
+        self.RefreshItem(item)
+
+    def __on_end_label_edit(self, event: wx.ListEvent):
+        """Renames the item after its label has been edited.
+
+        Parameters
+        ------------
+        event: wx.ListEvent
+        """
+        if not event.IsEditCancelled():
+            self.texts[event.GetIndex()] = event.GetLabel()
+            self.__cache = None
+
+    def __on_item_deselected(self, event: wx.ListEvent):
+        """Clears the selected item when it is deselected by the user.
+
+        Parameters
+        ------------
+        event: wx.ListEvent
+        """
+        if event.GetIndex() == self.selected:
+            self.selected = -1
+
+        event.Skip()
+
+    def __on_item_selected(self, event: wx.ListEvent):
+        """Tracks the selected item when it is selected by the user.
+
+        Parameters
+        ------------
+        event: wx.ListEvent
+        """
+        self.selected = event.GetIndex()
+        event.Skip()
@@ -3,20 +3,42 @@ panel
 """
 
 
+import functools
 import os
 
 import wx
 
 from cartograpy import IMAGE_WILDCARD, ASSET_DIR, ALL_EXPAND
 from cartograpy import (
-    LayerAddEvent,
-    LayerBackwardEvent,
-    LayerDuplicateEvent,
-    LayerForwardEvent,
-    LayerRemoveEvent,
+    LAYER_ADD,
+    LAYER_BACKWARD,
+    LAYER_DUPLICATE,
+    LAYER_FORWARD,
+    LAYER_REMOVE,
+    LayerEvent,
 )
 
 
+@functools.cache
+def button_bitmap(name: str):
+    """Loads the bitmap of a button from the `assets` directory.
+
+    The bitmaps are only loaded once, so this must be called after the
+    `wx.App` has been created.
+
+    Parameters
+    ------------
+    name: str
+        the name of the button, such as `add` for `button_add.png`.
+
+    Returns
+    ---------
+    wx.Bitmap:
+        the bitmap of the button.
+    """
+    return wx.Bitmap(name=os.path.join(ASSET_DIR, f"button_{name}.png"))
+
+
 class LayerMenu(wx.Panel):
     """The layer menu controls the order and state of the layers in the
     inspector panel.
@@ -41,36 +63,37 @@ class LayerMenu(wx.Panel):
         self.__init_buttons()
         self.__size_widgets()
 
-        self.Bind(
-            event=wx.EVT_BUTTON,
-            handler=self.__on_button_add,
-            id=self.button_add.GetId(),
-        )
-        self.Bind(
-            event=wx.EVT_BUTTON,
-            handler=self.__on_button_backward,
-            id=self.button_backward.GetId(),
-        )
-        self.Bind(
-            event=wx.EVT_BUTTON,
-            handler=self.__on_button_duplicate,
-            id=self.button_duplicate.GetId(),
-        )
-        self.Bind(
-            event=wx.EVT_BUTTON,
-            handler=self.__on_button_forward,
-            id=self.button_forward.GetId(),
-        )
-        self.Bind(
-            event=wx.EVT_BUTTON,
-            handler=self.__on_button_remove,
-            id=self.button_remove.GetId(),
-        )
+        # Actions posted to the parent for each button, except for add which
+        # asks for an image file first
+        self.button_actions = {
+            self.button_backward.GetId(): LAYER_BACKWARD,
+            self.button_duplicate.GetId(): LAYER_DUPLICATE,
+            self.button_forward.GetId(): LAYER_FORWARD,
+            self.button_remove.GetId(): LAYER_REMOVE,
+        }
+
+        self.Bind(event=wx.EVT_BUTTON, handler=self.__on_button)
 
     def reset(self):
         """Clears the current layer menu and resets all values."""
         pass
 
+    def __on_button(self, event: wx.CommandEvent):
+        """Posts a layer event with the action of the button that was clicked.
+
+        Parameters
+        ------------
+        event: wx.CommandEvent
+            contains information about command events, which originate from a
+            variety of simple controls.
+        """
+        if event.GetId() == self.button_add.GetId():
+            self.__on_button_add(event)
+
+        else:
+            action = self.button_actions[event.GetId()]
+            wx.PostEvent(self.Parent, LayerEvent(action=action))
+
     def __on_button_add(self, event: wx.CommandEvent):
         """Adds an image file as a layer.
 
@@ -93,51 +116,7 @@ class LayerMenu(wx.Panel):
 
             path = dialog.GetPath()
 
-        wx.PostEvent(self.Parent, LayerAddEvent(path=path))
-
-    def __on_button_backward(self, event: wx.CommandEvent):
-        """Moves the currently selected layer backward.
-
-        Parameters
-        ------------
-        event: wx.CommandEvent
-            contains information about command events, which originate from a
-            variety of simple controls.
-        """
-        wx.PostEvent(self.Parent, LayerBackwardEvent())
-
-    def __on_button_duplicate(self, event: wx.CommandEvent):
-        """Duplicates the currently selected layer.
-
-        Parameters
-        ------------
-        event: wx.CommandEvent
-            contains information about command events, which originate from a
-            variety of simple controls.
-        """
-        wx.PostEvent(self.Parent, LayerDuplicateEvent())
-
-    def __on_button_forward(self, event: wx.CommandEvent):
-        """Moves the currently selected layer forward.
-
-        Parameters
-        ------------
-        event: wx.CommandEvent
-            contains information about command events, which originate from a
-            variety of simple controls.
-        """
-        wx.PostEvent(self.Parent, LayerForwardEvent())
-
-    def __on_button_remove(self, event: wx.CommandEvent):
-        """Removes the currently selected layer.
-
-        Parameters
-        ------------
-        event: wx.CommandEvent
-            contains information about command events, which originate from a
-            variety of simple controls.
-        """
-        wx.PostEvent(self.Parent, LayerRemoveEvent())
+        wx.PostEvent(self.Parent, LayerEvent(action=LAYER_ADD, path=path))
 
     def __init_buttons(self):
         """Initializes the buttons."""
@@ -192,19 +171,11 @@ class LayerMenu(wx.Panel):
             name="Remove",
         )
 
-        add_bitmap = wx.Bitmap(name=os.path.join(ASSET_DIR, "button_add.png"))
-        backward_bitmap = wx.Bitmap(name=os.path.join(ASSET_DIR, "button_backward.png"))
-        duplicate_bitmap = wx.Bitmap(
-            name=os.path.join(ASSET_DIR, "button_duplicate.png")
-        )
-        forward_bitmap = wx.Bitmap(name=os.path.join(ASSET_DIR, "button_forward.png"))
-        remove_bitmap = wx.Bitmap(name=os.path.join(ASSET_DIR, "button_remove.png"))
-
-        self.button_add.SetBitmap(bitmap=add_bitmap)
-        self.button_backward.SetBitmap(bitmap=backward_bitmap)
-        self.button_duplicate.SetBitmap(bitmap=duplicate_bitmap)
-        self.button_forward.SetBitmap(bitmap=forward_bitmap)
-        self.button_remove.SetBitmap(bitmap=remove_bitmap)
+        self.button_add.SetBitmap(bitmap=button_bitmap("add"))
+        self.button_backward.SetBitmap(bitmap=button_bitmap("backward"))
+        self.button_duplicate.SetBitmap(bitmap=button_bitmap("duplicate"))
+        self.button_forward.SetBitmap(bitmap=button_bitmap("forward"))
+        self.button_remove.SetBitmap(bitmap=button_bitmap("remove"))
 
     def __size_widgets(self):
         """Generates the layout for the layer menu."""
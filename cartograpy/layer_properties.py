@@ -5,7 +5,7 @@ layer in the inspector.
 
 import wx
 
-from cartograpy import ALL_EXPAND, UpdateFilenameEvent
+from cartograpy import ALL_EXPAND, LAYER_UPDATE_FILENAME, LayerEvent
 
 
 class LayerProperties(wx.Panel):
@@ -24,13 +24,29 @@ class LayerProperties(wx.Panel):
         self.__init_widgets()
         self.__size_widgets()
 
+        # The item data of the layer that the properties are shown for
+        self.layer = None
+
+        # The filename and layer of the last edit, which are posted after a
+        # delay
+        self.filename_call = None
+        self.filename_edit = None
+
         self.Bind(wx.EVT_TEXT, self.__on_text_filename, id=self.filename.GetId())
 
+    def reset(self):
+        """Discards the layer and any filename edit that has not been posted."""
+        if self.filename_call is not None:
+            self.filename_call.Stop()
+
+        self.layer = None
+        self.filename_call = None
+        self.filename_edit = None
+
     def __init_widgets(self):
         """Initializes the layer properties widgets."""
         self.header = wx.StaticText(parent=self, label="Layer Properties")
         self.header.SetFont(wx.Font(wx.FontInfo().Bold()))
-        self.header_blank = wx.StaticText(parent=self, label="")
 
         self.x_label = wx.StaticText(parent=self, label="x")
         self.x = wx.TextCtrl(parent=self, size=(240, -1))
@@ -59,44 +75,66 @@ class LayerProperties(wx.Panel):
     def __on_text_filename(self, event: wx.CommandEvent):
         """When the filename property is changed.
 
+        The update is delayed until there have been no changes for 150ms, so
+        that typing a filename only posts a single event. The filename and the
+        layer are recorded when the filename is edited, since another layer
+        may be selected before the update is posted.
+
         Parameters
         ------------
         event: wx.CommandEvent
         """
-        wx.PostEvent(
-            self.Parent, UpdateFilenameEvent(filename=self.filename.GetValue())
-        )
+        pending = self.filename_call is not None and self.filename_call.IsRunning()
 
-    def __size_widgets(self):
-        """Places all the initialized widgets in the panel."""
-        sizer = wx.FlexGridSizer(cols=2, vgap=10, hgap=5)
-
-        sizer.Add(window=self.header, flag=ALL_EXPAND)
-        sizer.Add(window=self.header_blank, flag=ALL_EXPAND)
+        # Post the edit of the previous layer straight away
+        if pending and self.filename_edit[1] != self.layer:
+            self.filename_call.Stop()
+            self.__post_filename()
+            pending = False
 
-        sizer.Add(window=self.x_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.x, flag=ALL_EXPAND)
+        self.filename_edit = (self.filename.GetValue(), self.layer)
 
-        sizer.Add(window=self.y_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.y, flag=ALL_EXPAND)
+        if pending:
+            self.filename_call.Restart()
 
-        sizer.Add(window=self.z_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.z, flag=ALL_EXPAND)
+        else:
+            self.filename_call = wx.CallLater(150, self.__post_filename)
 
-        sizer.Add(window=self.w_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.w, flag=ALL_EXPAND)
+    def __post_filename(self):
+        """Posts the last edit of the filename property."""
+        filename, layer = self.filename_edit
 
-        sizer.Add(window=self.h_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.h, flag=ALL_EXPAND)
+        if layer is None:
+            return
 
-        sizer.Add(window=self.filename_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.filename, flag=ALL_EXPAND)
-
-        sizer.Add(window=self.zoom_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.zoom, flag=ALL_EXPAND)
+        wx.PostEvent(
+            self.Parent,
+            LayerEvent(action=LAYER_UPDATE_FILENAME, filename=filename, data=layer),
+        )
 
-        sizer.Add(window=self.isolate_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.isolate, flag=ALL_EXPAND)
+    def __size_widgets(self):
+        """Places all the initialized widgets in the panel.
 
-        self.SetSizer(sizer)
-        self.Layout()
+        The positions of the widgets are fixed, so a `wx.GridBagSizer` is used
+        to avoid resolving the rows and columns on every layout.
+        """
+        sizer = wx.GridBagSizer(vgap=10, hgap=5)
+
+        sizer.Add(self.header, pos=(0, 0), span=(1, 2), flag=ALL_EXPAND)
+
+        rows = [
+            (self.x_label, self.x),
+            (self.y_label, self.y),
+            (self.z_label, self.z),
+            (self.w_label, self.w),
+            (self.h_label, self.h),
+            (self.filename_label, self.filename),
+            (self.zoom_label, self.zoom),
+            (self.isolate_label, self.isolate),
+        ]
+
+        for row, (label, control) in enumerate(rows, start=1):
+            sizer.Add(label, pos=(row, 0), flag=ALL_EXPAND)
+            sizer.Add(control, pos=(row, 1), flag=ALL_EXPAND)
+
+        self.SetSizerAndFit(sizer)
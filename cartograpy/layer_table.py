@@ -0,0 +1,111 @@
+"""The layer table stores the state of the layers that is shared between the
+canvas and the minimap.
+"""
+
+
+import collections
+
+
+class LayerTable:
+    """The layer table stores the state of the layers that is shared between
+    the canvas and the minimap.
+
+    The canvas and the minimap render the same layers in the same order, so
+    they both read from a single layer table that is updated by the main
+    window, instead of each keeping a copy that must be updated in lock-step.
+
+    The columns of the table are:
+
+    - `order` is a list of layer data indicating the order to render the
+      layers.
+    - `visibility` is a list of flags indicating if each layer is shown.
+    - `paths` maps layer data to the path of the image.
+    - `references` counts the layers that use each image, so that checking if
+      an image is still used does not need to search all of the paths.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def to_dict(self):
+        """Returns the state of the layer table as a JSON compatible
+        dictionary.
+
+        Returns
+        ---------
+        dict:
+            the JSON compatible state of the layer table.
+        """
+        data = {
+            "order": self.order,
+            "visibility": self.visibility,
+            "paths": self.paths,
+        }
+
+        return data
+
+    def delete(self, index: int):
+        """Removes a layer.
+
+        Parameters
+        ------------
+        index: int
+            the index of the layer in the render order.
+
+        Returns
+        ---------
+        str:
+            the path of the image of the removed layer.
+        """
+        key = self.order.pop(index)
+        del self.visibility[index]
+
+        path = self.paths.pop(key)
+        self.references[path] -= 1
+
+        if self.references[path] == 0:
+            del self.references[path]
+
+        return path
+
+    def insert(self, index: int, key: int, path: str, visible: bool = True):
+        """Inserts a layer before the given index of the render order.
+
+        Parameters
+        ------------
+        index: int
+            the index of the layer in the render order.
+        key: int
+            the layer data of the layer.
+        path: str
+            the path of the image of the layer.
+        visible: bool
+            if the layer is shown.
+        """
+        self.order.insert(index, key)
+        self.visibility.insert(index, visible)
+        self.paths[key] = path
+        self.references[path] += 1
+
+    def reset(self):
+        """Clears the layer table."""
+        self.order = list()
+        self.visibility = list()
+        self.paths = dict()
+        self.references = collections.Counter()
+
+    def swap(self, i: int, j: int):
+        """Swaps two layers in the render order.
+
+        Parameters
+        ------------
+        i: int
+            the index of the first layer.
+        j: int
+            the index of the second layer.
+        """
+        self.order[i], self.order[j] = self.order[j], self.order[i]
+        self.visibility[i], self.visibility[j] = (
+            self.visibility[j],
+            self.visibility[i],
+        )
@@ -13,43 +13,125 @@ TODO: on file open
 """
 
 
+import collections
 import json
-import math
 import os
 import shutil
+import tempfile
+import threading
+import zipfile
 
 import numpy as np
 import wx
 
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
 from cartograpy import (
-    ROOT_DIR,
     ASSET_DIR,
     ALL_EXPAND,
-    EVT_LAYER_ADD,
-    EVT_LAYER_DUPLICATE,
-    EVT_LAYER_REMOVE,
+    EVT_LAYER,
     EVT_LAYER_SELECTED,
     EVT_SWAP_LAYER,
-    EVT_UPDATE_FILENAME,
     EVT_UPDATE_VISIBILITY,
-    LayerAddEvent,
-    LayerDuplicateEvent,
-    LayerRemoveEvent,
+    LAYER_ADD,
+    LAYER_DUPLICATE,
+    LAYER_REMOVE,
+    LAYER_UPDATE_FILENAME,
+    LayerEvent,
     LayerSelectedEvent,
     SwapLayerEvent,
-    UpdateFilenameEvent,
     UpdateVisibilityEvent,
     Rect,
     Rects,
 )
 from cartograpy.canvas import Canvas
 from cartograpy.inspector import Inspector
+from cartograpy.layer_table import LayerTable
 
 
 CTPY_WILDCARD = "CTPY Files (*.ctpy)|*.ctpy"
 JSON_WILDCARD = "JSON Files (*.json)|*.json"
 
 
+SAVE_DIALOG_STYLE = wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT
+
+
+MAX_SCALED_BITMAPS = 256
+
+
+# The Linux ioctl that clones a file on a copy-on-write filesystem
+FICLONE = 0x40049409
+
+
+# The direction each arrow key moves the selected layer
+ARROW_KEYS = {
+    wx.WXK_LEFT: (-1, 0),
+    wx.WXK_UP: (0, -1),
+    wx.WXK_RIGHT: (1, 0),
+    wx.WXK_DOWN: (0, 1),
+}
+
+
+def copy_image(source: str, destination: str):
+    """Copies an image into the temporary directory.
+
+    The image is cloned with the `FICLONE` ioctl when the filesystem supports
+    copy-on-write, such as Btrfs and XFS, so that the bytes are not copied.
+    Otherwise, it is copied by the kernel with `shutil.copyfile`. Either way
+    the copy is independent of the original, so the saved image is not
+    changed when the original is edited later.
+
+    Parameters
+    ------------
+    source: str
+        the path of the image.
+    destination: str
+        the path of the copy.
+    """
+    if fcntl is not None:
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+            return
+
+        except OSError:
+            pass
+
+    shutil.copyfile(source, destination)
+
+
+def write_savefile(savefile: str, data: str, paths: list):
+    """Writes a map to a savefile.
+
+    The savefile is a zip archive of the JSON data and the images, which are
+    streamed into the archive in a single pass. The images are mostly
+    compressed already, so the fastest compression level is used.
+
+    This is run on a background thread, so it must not use any wx objects.
+
+    Parameters
+    ------------
+    savefile: str
+        the path of the savefile.
+    data: str
+        the JSON data of the map.
+    paths: list
+        the paths of the images in the temporary directory.
+    """
+    with zipfile.ZipFile(
+        savefile, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as archive:
+        archive.writestr("data.json", data)
+
+        for path in paths:
+            archive.write(path, arcname=os.path.basename(path))
+
+
 class MainWindow(wx.Frame):
     """The main window that houses the application.
 
@@ -82,13 +164,28 @@ class MainWindow(wx.Frame):
         self.SetDoubleBuffered(True)
         self.SetSizeHints(wx.DefaultSize, wx.DefaultSize)
 
-        self.canvas = Canvas(parent=self)
-        self.inspector = Inspector(parent=self)
+        # The imported images are copied to a temporary directory for the
+        # whole session, which is removed when the window is closed
+        self.temp_dir = tempfile.mkdtemp(prefix="cartograpy_")
+
+        # Maps are saved on a background thread
+        self.save_thread = None
+
+        # The canvas and minimap share the order, visibility, and paths
+        self.layer_table = LayerTable()
+
+        self.canvas = Canvas(parent=self, layer_table=self.layer_table)
+        self.inspector = Inspector(parent=self, layer_table=self.layer_table)
 
         self.__init_menubar()
         self.__init_toolbar()
         self.__size_widgets()
 
+        # Window events
+        self.Bind(wx.EVT_CLOSE, self.__on_close)
+        self.inspector.minimap.Bind(wx.EVT_SHOW, self.__on_minimap_size)
+        self.inspector.minimap.Bind(wx.EVT_SIZE, self.__on_minimap_size)
+
         # Mouse events
         self.Bind(wx.EVT_LEFT_DOWN, self.__on_left_down)
         self.Bind(wx.EVT_MIDDLE_DOWN, self.__on_middle_down)
@@ -128,12 +225,16 @@ class MainWindow(wx.Frame):
         )
 
         # Custom layer events
-        self.Bind(EVT_LAYER_ADD, self.__on_layer_add)
-        self.Bind(EVT_LAYER_DUPLICATE, self.__on_layer_duplicate)
-        self.Bind(EVT_LAYER_REMOVE, self.__on_layer_remove)
+        self.layer_handlers = {
+            LAYER_ADD: self.__on_layer_add,
+            LAYER_DUPLICATE: self.__on_layer_duplicate,
+            LAYER_REMOVE: self.__on_layer_remove,
+            LAYER_UPDATE_FILENAME: self.__on_update_filename,
+        }
+
+        self.Bind(EVT_LAYER, self.__on_layer)
         self.Bind(EVT_LAYER_SELECTED, self.__on_layer_selected)
         self.Bind(EVT_SWAP_LAYER, self.__on_swap_layer)
-        self.Bind(EVT_UPDATE_FILENAME, self.__on_update_filename)
         self.Bind(EVT_UPDATE_VISIBILITY, self.__on_update_visibility)
 
         self.reset()
@@ -148,7 +249,7 @@ class MainWindow(wx.Frame):
         """
         data = {
             "counter": self.counter,
-            "paths": self.paths,
+            "paths": self.layer_table.paths,
             "destinations": self.destinations.tolist(),
             "canvas": self.canvas.to_dict(),
             "inspector": self.inspector.to_dict(),
@@ -158,6 +259,9 @@ class MainWindow(wx.Frame):
 
     def reset(self):
         """Clears the current map and resets all values."""
+        self.__wait_for_save()
+
+        self.layer_table.reset()
         self.canvas.reset()
         self.inspector.reset()
 
@@ -165,19 +269,32 @@ class MainWindow(wx.Frame):
         self.savefile = None
 
         self.counter = 0
-        self.paths = dict()
         self.bitmaps = dict()
         self.filenames = dict()
+        self.sources = dict()
         self.destinations = Rects()
+        self.scaled_bitmaps = collections.OrderedDict()
+        self.thumbnails = dict()
 
         self.x_mouse = 0
         self.y_mouse = 0
 
-        self.temp_dir = os.path.join(ROOT_DIR, "temp")
-        shutil.rmtree(self.temp_dir)
-        os.mkdir(self.temp_dir)
+        self.dx_pan = 0
+        self.dy_pan = 0
+        self.pan_pending = False
+
+        self.visibility_pending = False
+
+        self.refresh_pending = False
+        self.resize_pending = False
 
-        self.Refresh()
+        self.minimap_bounds = None
+
+        # Only the files are removed, the directory is reused
+        for entry in os.scandir(self.temp_dir):
+            os.remove(entry.path)
+
+        self.__refresh()
 
     def __continue(self):
         """Checks if the current state is saved and if not, asks the user if
@@ -201,6 +318,50 @@ class MainWindow(wx.Frame):
 
         return True
 
+    def __flush_pan(self):
+        """Applies the accumulated camera pan and repaints the canvas once.
+
+        Panning moves every layer by the same amount, so the bounds of the
+        layers are moved by the pan instead of being computed again, and only
+        the camera view of the minimap is updated.
+        """
+        self.canvas.destinations.pan(dx=self.dx_pan, dy=self.dy_pan)
+        self.canvas.invalidate()
+
+        if self.minimap_bounds is not None:
+            x_min, y_min, factor = self.minimap_bounds
+            self.minimap_bounds = (x_min + self.dx_pan, y_min + self.dy_pan, factor)
+            self.__update_camera()
+
+        self.dx_pan = 0
+        self.dy_pan = 0
+        self.pan_pending = False
+
+        self.__refresh()
+
+    def __flush_refresh(self):
+        """Updates the minimap and repaints the canvas once."""
+        resize = self.resize_pending
+
+        self.refresh_pending = False
+        self.resize_pending = False
+
+        self.minimap_bounds = None
+
+        self.__update_minimap(resize=resize)
+        self.__refresh()
+
+    def __flush_visibility(self):
+        """Rebuilds the render order after the visibility of the layers has
+        changed and repaints the canvas once.
+        """
+        self.visibility_pending = False
+
+        # Toggling a layer back and forth leaves the render order unchanged
+        if self.canvas.update_render_order():
+            self.inspector.minimap.update_render_order()
+            self.__refresh()
+
     def __init_menubar(self):
         """Initializes the menu bar.
 
@@ -316,6 +477,24 @@ class MainWindow(wx.Frame):
 
         self.toolbar.Realize()
 
+    def __on_close(self, event: wx.CloseEvent):
+        """Asks the user to confirm closing the window when the current map is
+        not saved, and removes the temporary directory when it is closed.
+
+        Parameters
+        ------------
+        event: wx.CloseEvent
+            a close event is sent when the window is being closed.
+        """
+        if event.CanVeto() and not self.__continue():
+            event.Veto()
+            return
+
+        self.__wait_for_save()
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        event.Skip()
+
     def __on_key_down(self, event: wx.KeyEvent):
         """Processes keyboard events.
 
@@ -324,88 +503,91 @@ class MainWindow(wx.Frame):
         event: wx.KeyEvent
             contains information about key press and release events.
         """
-        keycode = event.GetKeyCode()
-
-        if keycode == wx.WXK_LEFT:
-            selected = self.inspector.layers.GetFirstSelected()
-            index = -(selected + 1)
-            self.canvas.destinations.move(
-                index, dx=-math.ceil(self.canvas.scale_factor)
-            )
-
-            self.saved = False
-            self.__update_properties()
-            self.Refresh()
+        direction = ARROW_KEYS.get(event.GetKeyCode())
+        selected = self.inspector.layers.GetFirstSelected()
 
-        elif keycode == wx.WXK_UP:
-            selected = self.inspector.layers.GetFirstSelected()
-            index = -(selected + 1)
-            self.canvas.destinations.move(
-                index, dy=-math.ceil(self.canvas.scale_factor)
-            )
+        if direction is None or selected < 0:
+            return
 
-            self.saved = False
-            self.__update_properties()
-            self.Refresh()
+        index = -(selected + 1)
+        step = self.canvas.scale_step
 
-        elif keycode == wx.WXK_RIGHT:
-            selected = self.inspector.layers.GetFirstSelected()
-            index = -(selected + 1)
-            self.canvas.destinations.move(index, dx=math.ceil(self.canvas.scale_factor))
+        self.canvas.destinations.move(
+            index, dx=direction[0] * step, dy=direction[1] * step
+        )
+        self.canvas.invalidate()
 
-            self.saved = False
-            self.__update_properties()
-            self.Refresh()
+        self.saved = False
+        self.__update_properties()
+        self.__request_refresh()
 
-        elif keycode == wx.WXK_DOWN:
-            selected = self.inspector.layers.GetFirstSelected()
-            index = -(selected + 1)
-            self.canvas.destinations.move(index, dy=math.ceil(self.canvas.scale_factor))
+    def __on_layer(self, event: LayerEvent):
+        """Passes the layer event to the handler of its action.
 
-            self.saved = False
-            self.__update_properties()
-            self.Refresh()
+        Parameters
+        ------------
+        event: LayerEvent
+            the event is expected to have an `action` property.
+        """
+        self.layer_handlers[event.action](event)
 
-    def __on_layer_add(self, event: LayerAddEvent):
+    def __on_layer_add(self, event: LayerEvent):
         """Adds a layer from an image file.
 
         Parameters
         ------------
-        event: LayerAddEvent
+        event: LayerEvent
             the event is expected to have a `path` property.
         """
         layer_name = str(self.counter)
         filename = os.path.join("img", os.path.basename(event.path))
 
-        # Copy image to temporary directory
-        temp_file = os.path.join(self.temp_dir, layer_name)
-        shutil.copyfile(event.path, temp_file)
+        # An image that is imported more than once shares the same copy in
+        # the temporary directory and bitmaps, unless it has been modified since
+        source = (event.path, os.stat(event.path).st_mtime_ns)
+        temp_file = self.sources.get(source)
+
+        if temp_file is None:
+            temp_file = os.path.join(self.temp_dir, layer_name)
+            copy_image(event.path, temp_file)
+
+            # Load image file
+            bitmap = wx.Bitmap(name=temp_file)
+
+            self.sources[source] = temp_file
+            self.bitmaps[temp_file] = bitmap
+            self.filenames[temp_file] = filename
+            self.thumbnails[temp_file] = self.__thumbnail(bitmap)
+
+            self.canvas.bitmaps[temp_file] = self.__scale_bitmap(
+                temp_file, self.canvas.scale_factor
+            )
 
-        # Load image file
-        bitmap = wx.Bitmap(name=temp_file)
+            # The minimap factor is only known once the layers have been fitted
+            # to the minimap. The first layer is fitted on its own, which is the
+            # scale of its thumbnail, so it is not scaled from the full image
+            if not len(self.canvas.destinations):
+                self.inspector.minimap.scale_factor = self.thumbnails[temp_file][1]
+
+            self.inspector.minimap.bitmaps[temp_file] = self.__scale_thumbnail(
+                temp_file, self.inspector.minimap.scale_factor
+            )
+
+        bitmap = self.bitmaps[temp_file]
         destination = Rect(w=bitmap.GetWidth(), h=bitmap.GetHeight())
 
-        self.paths[self.counter] = temp_file
-        self.bitmaps[temp_file] = bitmap
-        self.filenames[temp_file] = filename
+        self.layer_table.insert(len(self.layer_table.order), self.counter, temp_file)
         self.destinations.append(rect=destination)
 
         # Update canvas
-        self.canvas.order.append(self.counter)
-        self.canvas.visibility.append(False)
-        self.canvas.paths[self.counter] = temp_file
-        self.canvas.bitmaps[temp_file] = self.__scale(bitmap, self.canvas.scale_factor)
         self.canvas.destinations.append(
             rect=destination.scale(self.canvas.scale_factor)
         )
+        self.canvas.update_render_order()
 
         # Update minimap
-        self.inspector.minimap.order.append(self.counter)
-        self.inspector.minimap.visibility.append(False)
-        self.inspector.minimap.paths[self.counter] = temp_file
-        self.inspector.minimap.bitmaps[temp_file] = bitmap
         self.inspector.minimap.destinations.append(rect=destination)
-        self.__update_minimap(resize=True)
+        self.inspector.minimap.update_render_order()
 
         # Update inspector layer
         self.inspector.layers.InsertItem(0, f"layer_{self.counter}")
@@ -413,44 +595,44 @@ class MainWindow(wx.Frame):
         self.inspector.layers.CheckItem(0)
         self.inspector.layers.Select(0)
 
-        # Update inspector layer properties
-        self.inspector.layer_properties.filename.SetValue(filename)
-
         self.counter += 1
         self.saved = False
         self.__update_properties()
-        self.Refresh()
+        self.__request_refresh(resize=True)
 
-    def __on_layer_duplicate(self, event: LayerDuplicateEvent):
+    def __on_layer_duplicate(self, event: LayerEvent):
         """Duplicates the currently selected layer.
 
         Parameters
         ------------
-        event: LayerDuplicateEvent
+        event: LayerEvent
         """
         selected = self.inspector.layers.GetFirstSelected()
 
-        # Get original
+        if selected < 0:
+            return
+
+        # Get original, the duplicate shares its copy of the image in the
+        # temporary directory
         selected_data = self.inspector.layers.GetItemData(selected)
-        path = self.canvas.paths[selected_data]
-        destination = self.canvas.destinations[selected_data]
+        path = self.layer_table.paths[selected_data]
         index = -(selected + 1)
 
-        self.paths[self.counter] = path
-        self.destinations.insert(index=index, rect=destination)
+        # The duplicate is rendered directly above the original
+        above = len(self.layer_table.order) - selected
+
+        self.layer_table.insert(above, self.counter, path)
+        self.destinations.insert_from(above, self.destinations, index)
 
         # Update canvas
-        self.canvas.order.insert(index, self.counter)
-        self.canvas.visibility.insert(index, False)
-        self.canvas.paths[self.counter] = path
-        self.canvas.destinations.insert(index=index, rect=destination)
+        self.canvas.destinations.insert_from(above, self.canvas.destinations, index)
+        self.canvas.update_render_order()
 
         # Update minimap
-        self.inspector.minimap.order.insert(index, self.counter)
-        self.inspector.minimap.visibility.insert(index, False)
-        self.inspector.minimap.paths[self.counter] = path
-        self.inspector.minimap.destinations.insert(index=index, rect=destination)
-        self.__update_minimap(resize=True)
+        self.inspector.minimap.destinations.insert_from(
+            above, self.inspector.minimap.destinations, index
+        )
+        self.inspector.minimap.update_render_order()
 
         # Update inspector
         self.inspector.layers.InsertItem(selected, f"layer_{self.counter}")
@@ -461,9 +643,9 @@ class MainWindow(wx.Frame):
         self.counter += 1
         self.saved = False
         self.__update_properties()
-        self.Refresh()
+        self.__request_refresh(resize=True)
 
-    def __on_layer_remove(self, event: LayerRemoveEvent):
+    def __on_layer_remove(self, event: LayerEvent):
         """Removes the currently selected layer.
 
         If there are no more references to the image layer, the image file is
@@ -471,14 +653,16 @@ class MainWindow(wx.Frame):
 
         Parameters
         ------------
-        event: LayerRemoveEvent
+        event: LayerEvent
         """
         selected = self.inspector.layers.GetFirstSelected()
-        item_data = self.inspector.layers.GetItemData(selected)
-        path = self.paths[item_data]
+
+        if selected < 0:
+            return
+
         index = -(selected + 1)
 
-        del self.paths[item_data]
+        path = self.layer_table.delete(index)
         self.destinations.delete(index)
 
         # Update inspector
@@ -486,27 +670,33 @@ class MainWindow(wx.Frame):
         self.inspector.layers.Select(selected)
 
         # Update canvas
-        del self.canvas.order[index]
-        del self.canvas.visibility[index]
-        del self.canvas.paths[item_data]
         self.canvas.destinations.delete(index)
+        self.canvas.update_render_order()
 
         # Update minimap
-        del self.inspector.minimap.order[index]
-        del self.inspector.minimap.visibility[index]
-        del self.inspector.minimap.paths[item_data]
-        self.inspector.minimap.delete(index)
+        self.inspector.minimap.destinations.delete(index)
+        self.inspector.minimap.update_render_order()
 
-        if path not in self.paths.values():
+        if path not in self.layer_table.references:
             del self.bitmaps[path]
+            del self.thumbnails[path]
             del self.inspector.minimap.bitmaps[path]
             del self.canvas.bitmaps[path]
+
+            for key in list(self.scaled_bitmaps):
+                if key[0] == path:
+                    del self.scaled_bitmaps[key]
+
+            for source, temp_file in list(self.sources.items()):
+                if temp_file == path:
+                    del self.sources[source]
+
+            self.__wait_for_save()
             os.remove(path)
 
-        self.__update_minimap(resize=True)
         self.saved = False
         self.__update_properties()
-        self.Refresh()
+        self.__request_refresh(resize=True)
 
     def __on_layer_selected(self, event: LayerSelectedEvent):
         """Updates the layer properties in the inspector when a layer is
@@ -522,6 +712,8 @@ class MainWindow(wx.Frame):
     def __on_left_down(self, event: wx.MouseEvent):
         """Processes mouse left button down events.
 
+        The topmost visible layer under the mouse is selected.
+
         Parameters
         ------------
         event: wx.MouseEvent
@@ -529,6 +721,13 @@ class MainWindow(wx.Frame):
         """
         self.x_mouse, self.y_mouse = event.GetPosition()
 
+        hits = self.canvas.destinations.hit_test(self.x_mouse, self.y_mouse)
+
+        for n in reversed(hits.tolist()):
+            if self.layer_table.visibility[n]:
+                self.inspector.layers.Select(len(self.layer_table.order) - n - 1)
+                break
+
     def __on_menubar_file_export_as(self, event: wx.MenuEvent):
         """Exports the current map as a JSON file.
 
@@ -541,7 +740,7 @@ class MainWindow(wx.Frame):
             parent=self,
             message="Save current map",
             wildcard=JSON_WILDCARD,
-            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+            style=SAVE_DIALOG_STYLE,
         ) as dialog:
             if dialog.ShowModal() == wx.ID_CANCEL:
                 return
@@ -558,7 +757,7 @@ class MainWindow(wx.Frame):
             key = self.inspector.layers.GetItemText(i)
             index = self.inspector.layers.GetItemData(i)
             value = {
-                "filename": self.filenames[self.paths[index]],
+                "filename": self.filenames[self.layer_table.paths[index]],
                 "position": self.canvas.destinations[index].to_dict(),
             }
 
@@ -575,7 +774,7 @@ class MainWindow(wx.Frame):
         event: wx.MenuEvent
             contains information about the menu event.
         """
-        if self.__continue:
+        if self.__continue():
             self.reset()
 
     def __on_menubar_file_open(self, event: wx.MenuEvent):
@@ -589,8 +788,7 @@ class MainWindow(wx.Frame):
         event: wx.MenuEvent
             contains information about the menu event.
         """
-        if self.__continue:
-            self.Close()
+        self.Close()
 
     def __on_menubar_file_save(self, event: wx.MenuEvent):
         """Updates the savefile with the current map."""
@@ -621,6 +819,18 @@ class MainWindow(wx.Frame):
         """
         self.x_mouse, self.y_mouse = event.GetPosition()
 
+    def __on_minimap_size(self, event: wx.Event):
+        """Fits the layers to the minimap again when the minimap is shown or
+        resized.
+
+        Parameters
+        ------------
+        event: wx.Event
+            a show or size event of the minimap.
+        """
+        self.__request_refresh(resize=True)
+        event.Skip()
+
     def __on_motion(self, event: wx.MouseEvent):
         """Processes mouse movement events.
 
@@ -640,14 +850,18 @@ class MainWindow(wx.Frame):
             self.y_mouse = y
 
             selected = self.inspector.layers.GetFirstSelected()
+
+            if selected < 0:
+                return
+
             index = -(selected + 1)
 
             self.canvas.destinations.move(index=index, dx=dx, dy=dy)
-            self.__update_minimap()
+            self.canvas.invalidate()
 
             self.saved = False
             self.__update_properties()
-            self.Refresh()
+            self.__request_refresh()
 
         # Pan camera
         elif event.MiddleIsDown():
@@ -659,11 +873,13 @@ class MainWindow(wx.Frame):
             self.x_mouse = x
             self.y_mouse = y
 
-            for i in range(len(self.destinations)):
-                self.canvas.destinations.move(index=i, dx=dx, dy=dy)
+            # Coalesce the pan until the pending events have been processed
+            self.dx_pan += dx
+            self.dy_pan += dy
 
-            self.__update_minimap()
-            self.Refresh()
+            if not self.pan_pending:
+                self.pan_pending = True
+                wx.CallAfter(self.__flush_pan)
 
     def __on_mousewheel(self, event: wx.MouseEvent):
         """Zooms in and out.
@@ -684,27 +900,34 @@ class MainWindow(wx.Frame):
         elif rotation < 0:
             self.canvas.zoom(dz=-1)
 
-        # Update destinations
-        n_layers = len(self.canvas.destinations)
-
-        self.canvas.destinations.rects[0] = np.full(n_layers, x) - (
-            self.canvas.scale_factor / old_factor
-        ) * (np.full(n_layers, x) - self.canvas.destinations.x)
-        self.canvas.destinations.rects[1] = np.full(n_layers, y) - (
-            self.canvas.scale_factor / old_factor
-        ) * (np.full(n_layers, y) - self.canvas.destinations.y)
-        self.canvas.destinations.rects[2] = (
-            self.destinations.w * self.canvas.scale_factor
-        )
-        self.canvas.destinations.rects[3] = (
-            self.destinations.h * self.canvas.scale_factor
+        if self.canvas.scale_factor == old_factor:
+            return
+
+        # Zoom the destinations about the mouse in place
+        ratio = self.canvas.scale_factor / old_factor
+        rects = self.canvas.destinations.rects
+
+        rects[0] -= x
+        rects[1] -= y
+        np.multiply(rects[:2], ratio, out=rects[:2], casting="unsafe")
+        rects[0] += x
+        rects[1] += y
+
+        np.multiply(
+            self.destinations.rects[2:],
+            self.canvas.scale_factor,
+            out=rects[2:],
+            casting="unsafe",
         )
 
-        for path, bitmap in self.bitmaps.items():
-            self.canvas.bitmaps[path] = self.__scale(bitmap, self.canvas.scale_factor)
+        for path in self.bitmaps:
+            self.canvas.bitmaps[path] = self.__scale_bitmap(
+                path, self.canvas.scale_factor
+            )
 
-        self.__update_minimap(resize=True)
-        self.Refresh()
+        self.canvas.update_render_order()
+        self.canvas.invalidate()
+        self.__request_refresh(resize=True)
 
     def __on_tool_colourpicker(self, event: wx.CommandEvent):
         """Opens the colour dialog and sets the draw colour.
@@ -721,7 +944,7 @@ class MainWindow(wx.Frame):
             colour = dialog.GetColourData().GetColour()
 
         self.saved = False
-        self.Refresh()
+        self.__refresh()
 
     def __on_swap_layer(self, event: SwapLayerEvent):
         """Swaps the order of two layers in the canvas and minimap.
@@ -733,63 +956,66 @@ class MainWindow(wx.Frame):
             property.
         """
         i, j = event.layers
+
+        if i == j:
+            return
+
         i = -(i + 1)
         j = -(j + 1)
 
-        self.canvas.order[i], self.canvas.order[j] = (
-            self.canvas.order[j],
-            self.canvas.order[i],
-        )
-        self.canvas.visibility[i], self.canvas.visibility[j] = (
-            self.canvas.visibility[j],
-            self.canvas.visibility[i],
-        )
-        self.canvas.destinations.rects[:, [i, j]] = self.canvas.destinations.rects[
-            :, [j, i]
-        ]
+        self.layer_table.swap(i, j)
+        self.destinations.swap(i, j)
 
-        self.inspector.minimap.order[i], self.inspector.minimap.order[j] = (
-            self.inspector.minimap.order[j],
-            self.inspector.minimap.order[i],
-        )
-        self.inspector.minimap.visibility[i], self.inspector.minimap.visibility[j] = (
-            self.inspector.minimap.visibility[j],
-            self.inspector.minimap.visibility[i],
-        )
-        self.inspector.minimap.destinations.rects[
-            :, [i, j]
-        ] = self.inspector.minimap.destinations.rects[:, [j, i]]
+        # The render order may be the same when swapping layers of the same
+        # image, but the destinations have still been swapped
+        self.canvas.destinations.swap(i, j)
+        self.canvas.update_render_order()
+        self.canvas.invalidate()
+
+        self.inspector.minimap.destinations.swap(i, j)
+        self.inspector.minimap.update_render_order()
+        self.inspector.minimap.invalidate()
 
         self.saved = False
-        self.Refresh()
+        self.__refresh()
 
-    def __on_update_filename(self, event: UpdateFilenameEvent):
+    def __on_update_filename(self, event: LayerEvent):
         """Updates the filename property.
 
         Parameters
         ------------
-        event: UpdateFilenameEvent
+        event: LayerEvent
+            the event is expected to have a string `filename` property and an
+            integer `data` property of the item data of the layer.
         """
-        self.filenames[self.paths[event.index]] = event.filename
+        # The layer may have been removed since the filename was edited
+        if event.data not in self.layer_table.paths:
+            return
+
+        self.filenames[self.layer_table.paths[event.data]] = event.filename
 
     def __on_update_visibility(self, event: UpdateVisibilityEvent):
-        """Updates the visibility of the currently selected layer.
+        """Updates the visibility of a layer.
 
         Parameters
         ------------
         event: UpdateVisibilityEvent
-            the event is expected to have a boolean `show` property.
+            the event is expected to have an integer `index` property of the
+            layer in the inspector and a boolean `show` property.
         """
-        selected = self.inspector.layers.GetFirstSelected()
-        index = -(selected + 1)
+        index = -(event.index + 1)
+
+        if self.layer_table.visibility[index] == event.show:
+            return
+
+        self.layer_table.visibility[index] = event.show
 
-        self.canvas.visibility[index] = not self.canvas.visibility[index]
-        self.inspector.minimap.visibility[
-            index
-        ] = not self.inspector.minimap.visibility[index]
+        # Coalesce the rebuild until the pending events have been processed
+        if not self.visibility_pending:
+            self.visibility_pending = True
+            wx.CallAfter(self.__flush_visibility)
 
         self.saved = False
-        self.Refresh()
 
     def __size_widgets(self):
         """Generates the layout for the canvas and inspector."""
@@ -811,59 +1037,99 @@ class MainWindow(wx.Frame):
         self.SetSizer(sizer)
         self.Layout()
 
+    def __update_camera(self):
+        """Updates the camera view of the minimap from the top left corner of
+        the layers and the minimap factor in `minimap_bounds`.
+        """
+        x_min, y_min, factor = self.minimap_bounds
+        w_canvas, h_canvas = self.canvas.size
+
+        self.inspector.minimap.camera.x = int(-x_min * factor)
+        self.inspector.minimap.camera.y = int(-y_min * factor)
+        self.inspector.minimap.camera.w = int(w_canvas * factor)
+        self.inspector.minimap.camera.h = int(h_canvas * factor)
+
     def __update_minimap(self, resize: bool = False):
-        """Updates the minimap from the canvas."""
-        x_min = self.canvas.destinations.x.min()
-        y_min = self.canvas.destinations.y.min()
-        w_max = (self.canvas.destinations.x + self.canvas.destinations.w).max() - x_min
-        h_max = (self.canvas.destinations.y + self.canvas.destinations.h).max() - y_min
+        """Updates the minimap from the canvas.
+
+        Nothing is updated while the minimap is hidden or collapsed, since the
+        minimap is updated again when it is shown or resized.
+        """
+        w_minimap, h_minimap = self.inspector.minimap.size
+
+        if (
+            not len(self.canvas.destinations)
+            or w_minimap <= 1
+            or h_minimap <= 1
+            or not self.inspector.minimap.IsShownOnScreen()
+        ):
+            self.minimap_bounds = None
+            return
 
-        w_minimap, h_minimap = self.inspector.minimap.GetSize().Get()
-        w_canvas, h_canvas = self.canvas.GetSize().Get()
+        x_min, y_min, x_max, y_max = self.canvas.destinations.bounds()
+        w_max = x_max - x_min
+        h_max = y_max - y_min
 
         w_factor = w_minimap / w_max
         h_factor = h_minimap / h_max
         factor = min(w_factor, h_factor)
 
-        # Update destinations
-        n_layers = len(self.canvas.destinations)
-
-        self.inspector.minimap.destinations.rects[0] = (
-            self.canvas.destinations.x - np.full(n_layers, x_min)
-        ) * factor
-        self.inspector.minimap.destinations.rects[1] = (
-            self.canvas.destinations.y - np.full(n_layers, y_min)
-        ) * factor
-        self.inspector.minimap.destinations.rects[2] = (
-            self.canvas.destinations.w * factor
-        )
-        self.inspector.minimap.destinations.rects[3] = (
-            self.canvas.destinations.h * factor
+        # Update destinations in place. The canvas sizes are already scaled by
+        # the zoom, so they are scaled straight into the minimap instead of
+        # from the unscaled sizes
+        changed = self.inspector.minimap.destinations.fit(
+            self.canvas.destinations, x_min, y_min, factor
         )
 
-        self.inspector.minimap.camera.x = int(-x_min * factor)
-        self.inspector.minimap.camera.y = int(-y_min * factor)
-        self.inspector.minimap.camera.w = int(w_canvas * factor)
-        self.inspector.minimap.camera.h = int(h_canvas * factor)
+        # Panning the camera moves every layer by the same amount, so the
+        # rendered minimap can be reused and only the camera view is moved
+        if changed:
+            self.inspector.minimap.invalidate()
+
+        self.minimap_bounds = (x_min, y_min, factor)
+        self.__update_camera()
+
+        # The canvas destinations are already zoomed, so the images are scaled
+        # by both factors. Zooming divides the minimap factor by the zoom ratio,
+        # so their product and the scaled bitmaps stay the same
+        scale_factor = factor * self.canvas.scale_factor
 
         # Avoid resizing when possible
-        if not resize or self.inspector.minimap.scale_factor == factor:
+        if not resize or self.inspector.minimap.scale_factor == scale_factor:
             return
 
         # Update resized bitmaps
-        self.inspector.minimap.scale_factor = factor
+        self.inspector.minimap.scale_factor = scale_factor
 
-        for path, bitmap in self.bitmaps.items():
-            self.inspector.minimap.bitmaps[path] = self.__scale(bitmap, factor)
+        for path in self.bitmaps:
+            self.inspector.minimap.bitmaps[path] = self.__scale_thumbnail(
+                path, scale_factor
+            )
+
+        self.inspector.minimap.update_render_order()
 
     def __update_properties(self):
-        """Updates the layer properties in the inspector from the canvas."""
-        x_min = self.canvas.destinations.x.min()
-        y_min = self.canvas.destinations.y.min()
+        """Updates the layer properties in the inspector from the canvas.
 
+        The properties of the layer are cleared when no layer is selected, such
+        as after the last layer has been removed.
+        """
         selected = self.inspector.layers.GetFirstSelected()
+
+        if selected < 0 or not len(self.canvas.destinations):
+            self.inspector.layer_properties.layer = None
+            self.inspector.layer_properties.filename.ChangeValue("")
+            self.inspector.layer_properties.x.ChangeValue("")
+            self.inspector.layer_properties.y.ChangeValue("")
+            self.inspector.layer_properties.w.ChangeValue("")
+            self.inspector.layer_properties.h.ChangeValue("")
+            return
+
+        x_min, y_min = self.canvas.destinations.rects[:2].min(axis=1).tolist()
         index = -(selected + 1)
 
+        layer = self.inspector.layers.GetItemData(selected)
+
         factor = self.canvas.scale_factor
         x = int((self.canvas.destinations.x[index] - x_min) / factor)
         y = int((self.canvas.destinations.y[index] - y_min) / factor)
@@ -871,32 +1137,119 @@ class MainWindow(wx.Frame):
         h = int(self.destinations.h[index])
         zoom = int(factor * 100)
 
-        self.inspector.layer_properties.x.SetValue(str(x))
-        self.inspector.layer_properties.y.SetValue(str(y))
-        self.inspector.layer_properties.w.SetValue(str(w))
-        self.inspector.layer_properties.h.SetValue(str(h))
-        self.inspector.layer_properties.zoom.SetValue(str(zoom) + "%")
+        # The filename is only shown when another layer is selected, so that
+        # moving the layer does not overwrite a filename that is being edited
+        if layer != self.inspector.layer_properties.layer:
+            self.inspector.layer_properties.layer = layer
+            self.inspector.layer_properties.filename.ChangeValue(
+                self.filenames[self.layer_table.paths[layer]]
+            )
+
+        self.inspector.layer_properties.x.ChangeValue(str(x))
+        self.inspector.layer_properties.y.ChangeValue(str(y))
+        self.inspector.layer_properties.w.ChangeValue(str(w))
+        self.inspector.layer_properties.h.ChangeValue(str(h))
+        self.inspector.layer_properties.zoom.ChangeValue(str(zoom) + "%")
 
         if not self.inspector.layer_properties.z.GetValue():
-            self.inspector.layer_properties.z.SetValue(str(0))
+            self.inspector.layer_properties.z.ChangeValue(str(0))
+
+    def __refresh(self):
+        """Repaints the canvas and the minimap.
+
+        Only the canvas and the minimap are repainted, instead of the whole
+        window, since the other widgets repaint themselves when they change.
+        The layers are only rendered again if the canvas has been invalidated
+        by a change to the destinations, bitmaps, or render order.
+        """
+        self.canvas.Refresh(eraseBackground=False)
+        self.inspector.minimap.Refresh(eraseBackground=False)
+
+    def __request_refresh(self, resize: bool = False):
+        """Updates the minimap and repaints the canvas after the pending events
+        have been processed, so that a burst of mouse or keyboard events only
+        repaints once.
+
+        Parameters
+        ------------
+        resize: bool
+            if the bitmaps of the minimap may need to be rescaled.
+        """
+        self.resize_pending = self.resize_pending or resize
+
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            wx.CallAfter(self.__flush_refresh)
 
     def __save(self):
-        """Writes the current map to disk."""
-        # Write JSON data to temporary directory
-        with open(os.path.join(self.temp_dir, "data.json"), "w") as file:
-            json.dump(self.to_dict(), file)
-
-        # Compress temporary directory
-        archivefile = shutil.make_archive(
-            base_name=self.savefile,
-            format="gztar",
-            root_dir=self.temp_dir,
-        )
+        """Writes the current map to disk.
+
+        The map is copied on the main thread and written on a background
+        thread, so that the application is not blocked while the images are
+        compressed. Saving is disabled until the savefile has been written.
+        """
+        # The save dialog was cancelled
+        if self.savefile is None:
+            return
 
-        # Rename archive to savefile
-        shutil.move(src=archivefile, dst=self.savefile)
+        data = json.dumps(self.to_dict())
+        paths = list(self.bitmaps)
 
         self.saved = True
+        self.menubar_file_save.Enable(False)
+        self.menubar_file_save_as.Enable(False)
+
+        self.save_thread = threading.Thread(
+            target=self.__save_in_background,
+            args=(self.savefile, data, paths),
+        )
+        self.save_thread.start()
+
+    def __save_done(self, error: Exception):
+        """Enables saving again after the savefile has been written.
+
+        Parameters
+        ------------
+        error: Exception
+            the error raised while writing the savefile, or `None` if it was
+            written.
+        """
+        self.menubar_file_save.Enable(True)
+        self.menubar_file_save_as.Enable(True)
+
+        if error is not None:
+            self.saved = False
+
+            wx.MessageBox(
+                message=f"The map could not be saved.\n\n{error}",
+                caption="Save failed",
+                style=wx.ICON_ERROR | wx.OK,
+                parent=self,
+            )
+
+    def __save_in_background(self, savefile: str, data: str, paths: list):
+        """Writes the savefile and reports back to the main thread.
+
+        Parameters
+        ------------
+        savefile: str
+            the path of the savefile.
+        data: str
+            the JSON data of the map.
+        paths: list
+            the paths of the images in the temporary directory.
+        """
+        # Any error is reported, otherwise saving would stay disabled
+        error = None
+
+        try:
+            write_savefile(savefile, data, paths)
+
+        except Exception as exception:
+            error = exception
+
+        finally:
+            wx.CallAfter(self.__save_done, error)
 
     def __save_dialog(self):
         """Asks the user for the savefile of the current map."""
@@ -904,7 +1257,7 @@ class MainWindow(wx.Frame):
             parent=self,
             message="Save current map",
             wildcard=CTPY_WILDCARD,
-            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+            style=SAVE_DIALOG_STYLE,
         ) as dialog:
             if dialog.ShowModal() == wx.ID_CANCEL:
                 return
@@ -917,14 +1270,143 @@ class MainWindow(wx.Frame):
 
         self.savefile = savefile
 
+    def __scale_bitmap(
+        self, path: str, scale: float, quality: int = wx.IMAGE_QUALITY_NORMAL
+    ):
+        """Scales the bitmap of an image.
+
+        The scaled bitmaps are cached by path, scaled size, and quality, so that
+        zooming back to a previous zoom level, or rescaling the minimap to a
+        similar size, does not scale the bitmaps again. The canvas and the
+        minimap share the cache. The least recently used bitmaps are discarded
+        when there are more than `MAX_SCALED_BITMAPS`.
+
+        Parameters
+        ------------
+        path: str
+            the path of the image in the temporary directory.
+        scale: float
+            the scale factor of the bitmap.
+        quality: int
+            the resampling quality, such as `wx.IMAGE_QUALITY_NEAREST` for
+            small thumbnails.
+
+        Returns
+        ---------
+        wx.Bitmap:
+            the scaled bitmap.
+        """
+        return self.__scale_cached(path, scale, quality)
+
+    def __scale_cached(
+        self, path: str, scale: float, quality: int, source: wx.Image = None
+    ):
+        """Scales an image to its size multiplied by the scale factor, using
+        the cache of scaled bitmaps.
+
+        Parameters
+        ------------
+        path: str
+            the path of the image in the temporary directory.
+        scale: float
+            the scale factor of the image.
+        quality: int
+            the resampling quality.
+        source: wx.Image
+            the image to scale, such as the thumbnail of the image. The bitmap
+            of the image is only converted to an image when it is not given and
+            the scaled bitmap is not cached.
+
+        Returns
+        ---------
+        wx.Bitmap:
+            the scaled bitmap.
+        """
+        bitmap = self.bitmaps[path]
+        key = (
+            path,
+            int(bitmap.GetWidth() * scale),
+            int(bitmap.GetHeight() * scale),
+            quality,
+        )
+
+        if key in self.scaled_bitmaps:
+            self.scaled_bitmaps.move_to_end(key)
+
+        else:
+            if source is None:
+                source = bitmap.ConvertToImage()
+
+            self.scaled_bitmaps[key] = self.__resize(source, *key[1:]).ConvertToBitmap()
+
+            if len(self.scaled_bitmaps) > MAX_SCALED_BITMAPS:
+                self.scaled_bitmaps.popitem(last=False)
+
+        return self.scaled_bitmaps[key]
+
+    def __scale_thumbnail(self, path: str, scale: float):
+        """Scales the bitmap of an image for the minimap.
+
+        The bitmap is scaled from the thumbnail of the image, unless the minimap
+        has grown since the thumbnail was made and the thumbnail is too small.
+
+        Parameters
+        ------------
+        path: str
+            the path of the image in the temporary directory.
+        scale: float
+            the scale factor of the image.
+
+        Returns
+        ---------
+        wx.Bitmap:
+            the scaled bitmap.
+        """
+        thumbnail, thumbnail_scale = self.thumbnails[path]
+
+        if scale > thumbnail_scale:
+            thumbnail = None
+
+        return self.__scale_cached(path, scale, wx.IMAGE_QUALITY_NEAREST, thumbnail)
+
     @staticmethod
-    def __scale(bitmap, scale):
-        """Scales a bitmap."""
-        return (
-            bitmap.ConvertToImage()
-            .Scale(
-                width=int(bitmap.GetWidth() * scale),
-                height=int(bitmap.GetHeight() * scale),
-            )
-            .ConvertToBitmap()
+    def __resize(image, width, height, quality=wx.IMAGE_QUALITY_NORMAL):
+        """Resizes an image."""
+        return image.Scale(width=max(1, width), height=max(1, height), quality=quality)
+
+    def __thumbnail(self, bitmap: wx.Bitmap):
+        """Scales an image down to a thumbnail for the minimap.
+
+        The minimap never shows an image larger than the minimap itself, so the
+        minimap bitmaps are scaled from the thumbnail instead of the full image.
+        The thumbnail is kept as a `wx.Image`, so that it does not need to be
+        converted from a bitmap every time it is scaled.
+
+        Parameters
+        ------------
+        bitmap: wx.Bitmap
+            the bitmap of the image.
+
+        Returns
+        ---------
+        tuple:
+            the thumbnail and its scale factor.
+        """
+        w_minimap, h_minimap = self.inspector.minimap.size
+        scale = min(w_minimap / bitmap.GetWidth(), h_minimap / bitmap.GetHeight(), 1)
+        thumbnail = self.__resize(
+            bitmap.ConvertToImage(),
+            int(bitmap.GetWidth() * scale),
+            int(bitmap.GetHeight() * scale),
         )
+
+        return thumbnail, scale
+
+    def __wait_for_save(self):
+        """Waits for the map to finish saving in the background, so that the
+        images are not removed from the temporary directory while they are
+        being written.
+        """
+        if self.save_thread is not None:
+            self.save_thread.join()
+            self.save_thread = None
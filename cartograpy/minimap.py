@@ -6,6 +6,8 @@ images.
 import wx
 
 from cartograpy import Rect, Rects
+from cartograpy.canvas import draw_bitmaps, same_render_order
+from cartograpy.layer_table import LayerTable
 
 
 class Minimap(wx.Panel):
@@ -20,25 +22,43 @@ class Minimap(wx.Panel):
 
     The internal parameters are:
 
-    - `render_order` is a list of layer data indicating the order to render the
-      layers.
-    - `path` maps layer data to the path of the image.
+    - `layer_table` is the `LayerTable` of the order, visibility, and image
+      paths of the layers, which is shared with the canvas.
+    - `render_order` is a list of the index and bitmap of the visible layers,
+      in the order they are rendered.
     - `bitmaps` maps the path of the image to a `wx.Bitmap` object.
     - `destinations` maps layer data to a `Rect` defining where on the minimap
       the corresponding bitmap will be rendered.
+    - `scene` is a `wx.Bitmap` of the rendered layers, which is reused until
+      the minimap is invalidated or resized. Only the camera view is drawn
+      over it on every repaint.
+    - `buffer` is the `wx.Bitmap` that the minimap is painted on before it is
+      shown, which is reused until the minimap is resized.
+    - `size` is the `(w, h)` size of the minimap, which is updated when the
+      minimap is resized.
 
     Parameters
     ------------
     parent: wx.Frame
         The parent window of this component.
+    layer_table: LayerTable
+        The order, visibility, and image paths of the layers.
     """
 
-    def __init__(self, parent: wx.Frame):
+    def __init__(self, parent: wx.Frame, layer_table: LayerTable):
         super().__init__(parent=parent, size=wx.Size(400, 400))
 
+        self.layer_table = layer_table
+        self.size = self.GetSize().Get()
+
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
 
         self.Bind(wx.EVT_PAINT, self.__on_paint)
+        self.Bind(wx.EVT_SIZE, self.__on_size)
+
+        # The camera view does not change between maps
+        self.camera_view = wx.Bitmap.FromRGBA(400, 400, 255, 255, 255, 128)
+        self.buffer = None
 
         self.reset()
 
@@ -51,9 +71,9 @@ class Minimap(wx.Panel):
             the JSON compatible state of the minimap.
         """
         data = {
-            "order": self.order,
-            "visibility": self.visibility,
-            "paths": self.paths,
+            "order": self.layer_table.order,
+            "visibility": self.layer_table.visibility,
+            "paths": self.layer_table.paths,
             "destinations": self.destinations.tolist(),
             "scale_factor": self.scale_factor,
             "camera": self.camera.to_dict(),
@@ -61,41 +81,112 @@ class Minimap(wx.Panel):
 
         return data
 
+    def invalidate(self):
+        """Discards the rendered scene so that the layers are rendered again on
+        the next repaint.
+
+        This should be called whenever the layers change. Moving the camera
+        does not need to invalidate the scene.
+        """
+        self.scene = None
+
     def reset(self):
         """Clears the current minimap and resets all values."""
-        self.order = list()
-        self.visibility = list()
-        self.paths = dict()
+        self.scene = None
+        self.render_order = list()
         self.bitmaps = dict()
         self.destinations = Rects()
 
         self.scale_factor = 1
 
         self.camera = Rect(w=400, h=400)
-        self.camera_view = wx.Bitmap.FromRGBA(400, 400, 255, 255, 255, 128)
+
+    def update_render_order(self):
+        """Rebuilds the list of visible layers from the order and visibility.
+
+        This should be called whenever the order, visibility, or bitmaps of the
+        layers change, so that the visibility and bitmaps do not need to be
+        looked up on every repaint. The scene is only invalidated if the render
+        order changed.
+
+        Returns
+        ---------
+        bool:
+            if the render order changed.
+        """
+        render_order = [
+            (n, self.bitmaps[self.layer_table.paths[key]])
+            for n, key in enumerate(self.layer_table.order)
+            if self.layer_table.visibility[n]
+        ]
+
+        if same_render_order(render_order, self.render_order):
+            return False
+
+        self.scene = None
+        self.render_order = render_order
+
+        return True
 
     def __on_paint(self, event: wx.PaintEvent):
         """Repaints the minimap.
 
+        The layers are only rendered when the scene has been invalidated,
+        otherwise the previously rendered scene is drawn under the camera view.
+
         Parameters
         ------------
         event: wx.PaintEvent
             a paint event is sent when a window's contents needs to be
             repainted.
         """
-        dc = wx.AutoBufferedPaintDC(self)
-        gc = wx.GraphicsContext.Create(dc)
+        size = self.GetClientSize()
+
+        if size.GetWidth() <= 0 or size.GetHeight() <= 0:
+            return
+
+        if self.buffer is None or self.buffer.GetSize() != size:
+            self.buffer = wx.Bitmap(size)
 
-        for n, key in enumerate(self.order):
-            if not self.visibility[n]:
-                continue
+        if self.scene is None:
+            self.scene = wx.Bitmap(size)
+            memory_dc = wx.MemoryDC(self.scene)
+            self.__render(memory_dc)
+            memory_dc.SelectObject(wx.NullBitmap)
 
-            gc.DrawBitmap(
-                bmp=self.bitmaps[self.paths[key]],
-                **self.destinations[n].to_dict(),
-            )
+        dc = wx.BufferedPaintDC(self, self.buffer)
+        dc.DrawBitmap(self.scene, 0, 0)
 
-        gc.DrawBitmap(
+        wx.GraphicsContext.Create(dc).DrawBitmap(
             bmp=self.camera_view,
             **self.camera.to_dict(),
         )
+
+    def __on_size(self, event: wx.SizeEvent):
+        """Discards the paint buffer and the scene when the minimap is resized.
+
+        Parameters
+        ------------
+        event: wx.SizeEvent
+            a size event is sent when the size of the minimap changes.
+        """
+        self.size = event.GetSize().Get()
+        self.buffer = None
+        self.scene = None
+        self.Refresh()
+        event.Skip()
+
+    def __render(self, dc: wx.DC):
+        """Renders the visible layers.
+
+        Parameters
+        ------------
+        dc: wx.DC
+            the device context to render the layers on.
+        """
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+
+        # Read the destinations once instead of once per layer
+        destinations = self.destinations.rects.T.tolist()
+        draw_bitmaps(dc, self.render_order, destinations)
@@ -0,0 +1,331 @@
+"""Rectangles that define where the layers are rendered."""
+
+
+import numpy as np
+
+from cartograpy import kernels
+
+
+class Rect:
+    """Represents a rectangle.
+
+    The slots are declared by hand rather than with `dataclass(slots=True)`,
+    which is not available before Python 3.10.
+    """
+
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x: int = 0, y: int = 0, w: int = 0, h: int = 0):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+
+    def __eq__(self, other):
+        if not isinstance(other, Rect):
+            return NotImplemented
+
+        return (self.x, self.y, self.w, self.h) == (other.x, other.y, other.w, other.h)
+
+    def __repr__(self):
+        return f"Rect(x={self.x}, y={self.y}, w={self.w}, h={self.h})"
+
+    def to_dict(self):
+        return {
+            "x": self.x,
+            "y": self.y,
+            "w": self.w,
+            "h": self.h,
+        }
+
+    def scale(self, scale):
+        return Rect(self.x * scale, self.y * scale, self.w * scale, self.h * scale)
+
+
+class Rects:
+    """Represents a group of rectangles.
+
+    This class uses numpy arrays for faster calculations. The rectangles are
+    stored in a preallocated buffer that grows geometrically, so that appending
+    and inserting rectangles does not reallocate the array every time. Pixel
+    coordinates are stored as 32-bit integers, so any fractional values are
+    truncated.
+
+    The `rects`, `x`, `y`, `w`, and `h` properties are views of the buffer
+    rather than copies, so they can be passed to numpy functions without
+    allocating, and writing to them changes the rectangles. The views are only
+    valid until the next insert, since growing the buffer reallocates it.
+    """
+
+    def __init__(self, rects: list = None):
+        if rects is None:
+            rects = list()
+
+        if isinstance(rects, np.ndarray):
+            array = rects
+
+        else:
+            rows = [[rect.x, rect.y, rect.w, rect.h] for rect in rects]
+            array = np.array(rows, dtype=np.int32).reshape(-1, 4).T
+
+        # Leave room to grow, so that adding a layer to a loaded map does not
+        # reallocate the buffer straight away
+        self._size = array.shape[1]
+        self._cap = max(8, 2 * self._size)
+        self._buf = np.empty((4, self._cap), dtype=np.int32)
+        self._buf[:, : self._size] = array
+
+    @classmethod
+    def from_array(cls, array):
+        """Creates the rectangles from an array of shape `(4, N)`, such as the
+        output of `tolist()`.
+
+        Parameters
+        ------------
+        array: array_like
+            the x-coordinates, y-coordinates, widths, and heights of the
+            rectangles.
+
+        Returns
+        ---------
+        Rects:
+            the rectangles.
+        """
+        return cls(np.asarray(array, dtype=np.int32).reshape(4, -1))
+
+    def append(self, rect: Rect):
+        self.insert(self._size, rect)
+
+    def bounds(self):
+        """Returns the smallest rectangle that contains all of the rectangles as
+        an `(x_min, y_min, x_max, y_max)` tuple.
+        """
+        return kernels.bounds(self.rects)
+
+    def cull(self, x: int, y: int, w: int, h: int):
+        """Finds the rectangles that overlap a viewport.
+
+        Parameters
+        ------------
+        x: int
+            the x-coordinate of the top left corner of the viewport.
+        y: int
+            the y-coordinate of the top left corner of the viewport.
+        w: int
+            the width of the viewport.
+        h: int
+            the height of the viewport.
+
+        Returns
+        ---------
+        np.ndarray:
+            a boolean mask that is `True` for the rectangles that overlap the
+            viewport.
+        """
+        return (
+            (self.x < x + w)
+            & (x < self.x + self.w)
+            & (self.y < y + h)
+            & (y < self.y + self.h)
+        )
+
+    def delete(self, index: int):
+        index = self.__normalize(index)
+
+        kernels.shift_left(self._buf, index, self._size)
+        self._size -= 1
+
+    def draw_args(self, index: int):
+        """Returns the rectangle as an `(x, y, w, h)` tuple of integers."""
+        return tuple(self.rects[:, index].tolist())
+
+    def fit(self, rects: "Rects", x: int, y: int, factor: float):
+        """Sets these rectangles to a group of rectangles of the same size,
+        moved so that `(x, y)` is the origin and scaled by the factor.
+
+        Parameters
+        ------------
+        rects: Rects
+            the rectangles to fit.
+        x: int
+            the x-coordinate of the new origin.
+        y: int
+            the y-coordinate of the new origin.
+        factor: float
+            the scale factor of the rectangles.
+
+        Returns
+        ---------
+        bool:
+            `True` if any of these rectangles changed.
+        """
+        if len(rects) != self._size:
+            raise ValueError(f"cannot fit {len(rects)} rectangles into {self._size}")
+
+        return kernels.fit(rects.rects, self.rects, int(x), int(y), float(factor))
+
+    def get(self, index: int):
+        return self[index]
+
+    def hit_test(self, x: int, y: int):
+        """Finds the rectangles that contain a point.
+
+        Parameters
+        ------------
+        x: int
+            the x-coordinate of the point.
+        y: int
+            the y-coordinate of the point.
+
+        Returns
+        ---------
+        np.ndarray:
+            the indices of the rectangles that contain the point, in ascending
+            order.
+        """
+        return np.nonzero(
+            (self.x <= x)
+            & (x < self.x + self.w)
+            & (self.y <= y)
+            & (y < self.y + self.h)
+        )[0]
+
+    def insert(self, index: int, rect: Rect):
+        self.__insert_column(index, [rect.x, rect.y, rect.w, rect.h])
+
+    def insert_from(self, index: int, rects: "Rects", column: int):
+        """Inserts a copy of a rectangle from a group of rectangles, without
+        creating a `Rect`.
+
+        Parameters
+        ------------
+        index: int
+            the index to insert the rectangle before.
+        rects: Rects
+            the rectangles to copy from, which may be these rectangles.
+        column: int
+            the index of the rectangle to copy.
+        """
+        # Copy the column first, since inserting may shift or reallocate it
+        self.__insert_column(index, rects.rects[:, column].copy())
+
+    def move(self, index: int, dx: int = 0, dy: int = 0):
+        """Moves a single rectangle.
+
+        Use `pan` to move all of the rectangles at once.
+        """
+        kernels.move(self._buf, self.__normalize(index), dx, dy)
+
+    def pan(self, dx: int = 0, dy: int = 0):
+        """Moves all of the rectangles by the same amount."""
+        kernels.pan(self.rects, dx, dy)
+
+    def set(self, index: int, rect: Rect):
+        self[index] = rect
+
+    def size(self):
+        return len(self)
+
+    def swap(self, i: int, j: int):
+        """Swaps two rectangles in place.
+
+        Parameters
+        ------------
+        i: int
+            the index of the first rectangle.
+        j: int
+            the index of the second rectangle.
+        """
+        kernels.swap(self._buf, self.__normalize(i), self.__normalize(j))
+
+    def tolist(self):
+        """Returns the rectangles as a JSON compatible list of the x-coordinates,
+        y-coordinates, widths, and heights.
+        """
+        return self.rects.tolist()
+
+    @property
+    def rects(self):
+        return self._buf[:, : self._size]
+
+    @property
+    def x(self):
+        return self._buf[0, : self._size]
+
+    @property
+    def y(self):
+        return self._buf[1, : self._size]
+
+    @property
+    def w(self):
+        return self._buf[2, : self._size]
+
+    @property
+    def h(self):
+        return self._buf[3, : self._size]
+
+    def __grow(self, gap: int):
+        """Doubles the capacity of the buffer.
+
+        The existing rectangles are copied into the new buffer leaving an empty
+        column at `gap`, so that inserting does not need to shift them again.
+        """
+        self._cap = max(8, 2 * self._cap)
+
+        buf = np.empty((4, self._cap), dtype=np.int32)
+        buf[:, :gap] = self._buf[:, :gap]
+        buf[:, gap + 1 : self._size + 1] = self._buf[:, gap : self._size]
+        self._buf = buf
+
+    def __insert_column(self, index: int, column):
+        """Inserts the x-coordinate, y-coordinate, width, and height of a
+        rectangle before the index.
+        """
+        index = self.__normalize(index, end=True)
+
+        if self._size == self._cap:
+            self.__grow(gap=index)
+
+        elif index < self._size:
+            kernels.shift_right(self._buf, index, self._size)
+
+        self._buf[:, index] = column
+        self._size += 1
+
+    def __normalize(self, index: int, end: bool = False):
+        """Converts a negative index to the equivalent positive index.
+
+        Parameters
+        ------------
+        index: int
+            the index of a rectangle.
+        end: bool
+            if the index after the last rectangle is valid, such as when
+            inserting like `np.insert`.
+
+        Returns
+        ---------
+        int:
+            the positive index.
+
+        Raises
+        --------
+        IndexError:
+            if the index is out of range.
+        """
+        if not -self._size <= index < self._size + end:
+            raise IndexError(f"index {index} is out of range for size {self._size}")
+
+        if index < 0:
+            index += self._size
+
+        return index
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key: int):
+        return Rect(*self.rects[:, key])
+
+    def __setitem__(self, key: int, value: Rect):
+        self.rects[:, key] = [value.x, value.y, value.w, value.h]
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from cartograpy import kernels
+
+
+def get_fit(variant):
+    if variant == "numpy":
+        return kernels._fit_numpy
+
+    numba = pytest.importorskip("numba")
+
+    return numba.njit(kernels._fit_loop)
+
+
+@pytest.mark.parametrize("variant", ["numpy", "numba"])
+def test_fit_with_int32_origin(variant):
+    fit = get_fit(variant)
+
+    source = np.array([[10, 20], [30, 40], [100, 200], [50, 60]], dtype=np.int32)
+    target = np.zeros_like(source)
+
+    assert fit(source, target, np.int32(1), np.int32(2), 0.5)
+    assert target.tolist() == [[4, 9], [14, 19], [50, 100], [25, 30]]
+
+    # Fitting again with the same values leaves the target unchanged
+    assert not fit(source, target, np.int32(1), np.int32(2), 0.5)